@@ -1,53 +1,240 @@
 import os
 import asyncio
+import time
 from datetime import date
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Set
 
 import httpx
-from cachetools import TTLCache
+import orjson
+from cachetools import LRUCache
 from dotenv import load_dotenv
 
+from cassette import make_transport
+from fixture_index import fixture_index
+from metrics import UPSTREAM_DEGRADED, UPSTREAM_IN_FLIGHT, MeteredTTLCache, observe_upstream
+from priority import current_priority
+from query import FixtureQuery
+from quota import quota
+from scheduler import scheduler
+from tracing import Span, current_trace, record_hit
+
 load_dotenv()
 
 API_KEY = os.getenv("API_FOOTBALL_KEY")
 BASE_URL = "https://v3.football.api-sports.io"
-HEADERS = {"x-apisports-key": API_KEY}
+HEADERS = {"x-apisports-key": API_KEY} if API_KEY else {}
 
 # —――――――――――――――――――――――――――――――――
-# Global HTTP client (reused for all requests)
-_client = httpx.AsyncClient(
-    base_url=BASE_URL,
-    headers=HEADERS,
-    timeout=5.0,
-    http2=True
-)
+# HTTP client: one per worker, created on first use or by the app lifespan
+# so importing this module stays cheap and pool sizes can come from env
+UPSTREAM_TIMEOUT = float(os.getenv("UPSTREAM_TIMEOUT", "5"))
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "1") == "1"
+UPSTREAM_MAX_CONNECTIONS = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+UPSTREAM_MAX_KEEPALIVE = int(os.getenv("UPSTREAM_MAX_KEEPALIVE", "20"))
+UPSTREAM_KEEPALIVE_EXPIRY = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30"))
+UPSTREAM_DRAIN_TIMEOUT = float(os.getenv("UPSTREAM_DRAIN_TIMEOUT", "10"))
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def create_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=UPSTREAM_MAX_CONNECTIONS,
+        max_keepalive_connections=UPSTREAM_MAX_KEEPALIVE,
+        keepalive_expiry=UPSTREAM_KEEPALIVE_EXPIRY,
+    )
+    return httpx.AsyncClient(
+        base_url=BASE_URL,
+        headers=HEADERS,
+        timeout=UPSTREAM_TIMEOUT,
+        http2=UPSTREAM_HTTP2,
+        limits=limits,
+        # record/replay cassette when UPSTREAM_MODE is set (see cassette.py)
+        transport=transport or make_transport(UPSTREAM_HTTP2, limits),
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = create_client()
+    return _client
+
+
+async def start_client(transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+    global _client
+    if _client is None:
+        _client = create_client(transport)
+    return _client
+
+
+async def close_client(timeout: float = UPSTREAM_DRAIN_TIMEOUT) -> None:
+    """Let in-flight upstream calls finish (up to `timeout`), then close the pool."""
+    global _client
+    deadline = time.monotonic() + timeout
+    while scheduler.in_use and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
 
 # —――――――――――――――――――――――――――――――――
 # Caches + lock
-fixture_cache     = TTLCache(maxsize=1000, ttl=300)
-predictions_cache = TTLCache(maxsize=1000, ttl=3600)
-odds_cache        = TTLCache(maxsize=1000, ttl=3600)
-general_cache     = TTLCache(maxsize=1000, ttl=86400)
+fixture_cache     = MeteredTTLCache("fixture", maxsize=1000, ttl=300)
+predictions_cache = MeteredTTLCache("predictions", maxsize=1000, ttl=3600)
+odds_cache        = MeteredTTLCache("odds", maxsize=1000, ttl=3600)
+general_cache     = MeteredTTLCache("general", maxsize=1000, ttl=86400)
+# in-play events/statistics maintained by inplay.InPlayTracker; records of
+# finished fixtures never change again and are kept without a TTL
+inplay_cache      = {}
+final_cache       = LRUCache(maxsize=10000)
 _cache_lock       = asyncio.Lock()
 
+# warm start: TTL caches are written here at shutdown and reloaded at startup
+CACHE_SNAPSHOT_PATH = os.getenv("CACHE_SNAPSHOT_PATH", "")
+_snapshot_caches = (fixture_cache, predictions_cache, odds_cache, general_cache)
+
+
+def save_cache_snapshot(path: str = CACHE_SNAPSHOT_PATH) -> None:
+    if not path:
+        return
+    snapshot = {
+        "saved_at": time.time(),
+        "caches": {cache.name: cache.dump() for cache in _snapshot_caches},
+        "final": list(final_cache.items()),
+    }
+    # per process: with several workers each one writes at shutdown
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(snapshot))
+    os.replace(tmp, path)
+
+
+def load_cache_snapshot(path: str = CACHE_SNAPSHOT_PATH) -> int:
+    """Restore a snapshot, minus the time since it was saved; returns entries loaded."""
+    if not path:
+        return 0
+    try:
+        with open(path, "rb") as f:
+            snapshot = orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return 0
+    downtime = max(0.0, time.time() - snapshot.get("saved_at", 0))
+    loaded = 0
+    for cache in _snapshot_caches:
+        entries = snapshot.get("caches", {}).get(cache.name, [])
+        loaded += cache.restore((key, left - downtime, value) for key, left, value in entries)
+    for key, value in snapshot.get("final", []):
+        final_cache[key] = value
+        loaded += 1
+    return loaded
+
+# —――――――――――――――――――――――――――――――――
+# Ingest projections: applied once to every upstream payload before it is
+# cached. Only `response` (plus `paging` when there is more than one page)
+# is kept, and the per-endpoint fields below are dropped from each item.
+
+def _env_fields(name: str, default: str) -> Set[str]:
+    return {f.strip() for f in os.getenv(name, default).split(",") if f.strip()}
+
+INGEST_PROJECTION = os.getenv("INGEST_PROJECTION", "1") == "1"
+INGEST_DROP: Dict[str, Set[str]] = {
+    # empty by default: every field is part of some public response; e.g.
+    # INGEST_DROP_PREDICTIONS=h2h trades predictions' h2h for a smaller cache
+    "predictions": _env_fields("INGEST_DROP_PREDICTIONS", ""),
+    "odds":        _env_fields("INGEST_DROP_ODDS", ""),
+    "fixtures":    _env_fields("INGEST_DROP_FIXTURES", ""),
+}
+
+def project_payload(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    if not INGEST_PROJECTION:
+        return data
+    response = data.get("response", [])
+    drop = INGEST_DROP.get(endpoint)
+    if drop and isinstance(response, list):
+        response = [
+            {k: v for k, v in item.items() if k not in drop} if isinstance(item, dict) else item
+            for item in response
+        ]
+    slim: Dict[str, Any] = {"response": response}
+    paging = data.get("paging") or {}
+    if paging.get("total", 1) > 1:
+        slim["paging"] = paging
+    return slim
+
 
 async def fetch(
     endpoint: str,
     params: Optional[Dict[str, Any]] = None,
-    cache: Optional[TTLCache] = None,
+    cache: Optional[MeteredTTLCache] = None,
     cache_key: Optional[str] = None
+) -> Dict[str, Any]:
+    trace = current_trace()
+    if trace is None:
+        return await _fetch(endpoint, params, cache, cache_key, None)
+    span = trace.start(endpoint, params)
+    try:
+        return await _fetch(endpoint, params, cache, cache_key, span)
+    finally:
+        trace.finish(span)
+
+
+async def _fetch(
+    endpoint: str,
+    params: Optional[Dict[str, Any]],
+    cache: Optional[MeteredTTLCache],
+    cache_key: Optional[str],
+    span: Optional[Span]
 ) -> Dict[str, Any]:
     if cache is not None and cache_key is not None:
         async with _cache_lock:
+            if span is not None:
+                span.lock_wait = time.perf_counter() - span.start
             if cache_key in cache:
+                cache.hits.inc()
+                if span is not None:
+                    span.cache = "hit"
                 return cache[cache_key]
-
-    try:
-        resp = await _client.get(endpoint, params=params)
-        resp.raise_for_status()
-        data = resp.json()
-    except Exception:
-        data = {"response": []}
+        cache.misses.inc()
+        if span is not None:
+            span.cache = "miss"
+
+    level = current_priority()
+    if not quota.allows(level):
+        # cached-only mode: keep the remaining budget for higher priorities
+        UPSTREAM_DEGRADED.labels(level.name.lower()).inc()
+        if span is not None:
+            span.cache, span.ok = "degraded", False
+        return {"response": [], "errors": ["upstream quota reserved for higher-priority requests"]}
+
+    # bulk/background calls wait here, behind interactive ones
+    async with scheduler.slot() as queue_wait:
+        quota.consume()
+        started = time.perf_counter()
+        UPSTREAM_IN_FLIGHT.inc()
+        resp = None
+        try:
+            resp = await get_client().get(endpoint, params=params)
+            quota.update(resp.headers)
+            resp.raise_for_status()
+            data = resp.json()
+        except Exception:
+            resp = None
+            # failures are not cached, the next call retries upstream
+            return {"response": [], "errors": ["upstream request failed"]}
+        finally:
+            UPSTREAM_IN_FLIGHT.dec()
+            observe_upstream(endpoint, started, resp)
+            if span is not None:
+                span.queue_wait = queue_wait
+                span.upstream = time.perf_counter() - started
+                span.ok = resp is not None
+    if data.get("errors"):
+        # API-Football reports quota/parameter errors with a 200
+        if span is not None:
+            span.ok = False
+        return {"response": [], "errors": data["errors"]}
+    data = project_payload(endpoint, data)
 
     if cache is not None and cache_key is not None:
         async with _cache_lock:
@@ -60,10 +247,21 @@ async def fetch(
 # Fixtures
 
 async def get_raw_fixtures(date_str: str) -> Dict[str, Any]:
-    return await fetch(
+    raw = await fetch(
         "fixtures",
-        params={"date": date_str, "timezone": "Europe/Belgrade"}
+        params={"date": date_str, "timezone": "Europe/Belgrade"},
+        cache=fixture_cache,
+        cache_key=f"fixtures_raw_{date_str}"
     )
+    if not raw.get("errors"):
+        # no-op unless this payload was just fetched
+        fixture_index.ingest(date_str, raw)
+    return raw
+
+async def ensure_fixtures_indexed(dates: List[str]) -> None:
+    # always through the cache: a hit is cheap and re-ingests nothing, while an
+    # expired entry is refetched so the index follows status/score changes
+    await asyncio.gather(*(get_raw_fixtures(d) for d in dates))
 
 async def get_live_fixtures() -> Dict[str, Any]:
     return await fetch(
@@ -73,41 +271,63 @@ async def get_live_fixtures() -> Dict[str, Any]:
         cache_key="live_fixtures"
     )
 
-async def get_fixtures_by_date(date_str: str) -> Dict[str, Any]:
+def _has_logos(fx: Dict[str, Any]) -> bool:
+    teams = fx["teams"]
+    return bool(fx["league"].get("logo") and teams["home"].get("logo") and teams["away"].get("logo"))
+
+async def _with_predictions_odds(fixtures: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # copies, so the raw fixtures payload is never mutated
+    pairs = await asyncio.gather(*(
+        asyncio.gather(get_predictions_cached(fx["fixture"]["id"]), get_odds_cached(fx["fixture"]["id"]))
+        for fx in fixtures
+    ))
+    return [
+        {**fx, "predictions": pred.get("response", []), "odds": odds.get("response", [])}
+        for fx, (pred, odds) in zip(fixtures, pairs)
+    ]
+
+async def get_fixtures_by_date(date_str: str, query: Optional[FixtureQuery] = None) -> Dict[str, Any]:
     cache_key = f"fixtures_enriched_{date_str}"
+    started = time.perf_counter()
     async with _cache_lock:
-        if cache_key in fixture_cache:
-            return fixture_cache[cache_key]
-
-    raw = await get_raw_fixtures(date_str)
-    resp = raw.get("response", [])
-    enriched = []
-
-    for fx in resp:
-        fid     = fx["fixture"]["id"]
-        pred_task = get_predictions_cached(fid)
-        odds_task = get_odds_cached(fid)
-        pred, odds = await asyncio.gather(pred_task, odds_task)
-
-        fx["predictions"] = pred.get("response", [])
-        fx["odds"]        = odds.get("response", [])
-
-        # filter out ones missing logos
-        league = fx["league"]
-        teams  = fx["teams"]
-        if league.get("logo") and teams["home"].get("logo") and teams["away"].get("logo"):
-            enriched.append(fx)
+        result = fixture_cache.get(cache_key)
+
+    if result is not None:
+        fixture_cache.hits.inc()
+        record_hit("fixtures_enriched", {"date": date_str}, started)
+    else:
+        fixture_cache.misses.inc()
+        raw = await get_raw_fixtures(date_str)
+        # filter out ones missing logos before any lookups are spent on them
+        fixtures = [fx for fx in raw.get("response", []) if _has_logos(fx)]
+        if query is not None and (query.filtered or query.paginated):
+            # enrich only the selected page, leave the whole-day cache cold
+            page, next_cursor = query.select(fixtures)
+            return query.envelope(await _with_predictions_odds(page), next_cursor)
+
+        result = {"response": await _with_predictions_odds(fixtures)}
+        async with _cache_lock:
+            fixture_cache[cache_key] = result
 
-    result = {"response": enriched}
-    async with _cache_lock:
-        fixture_cache[cache_key] = result
-    return result
+    if query is None:
+        return result
+    page, next_cursor = query.select(result["response"])
+    return query.envelope(page, next_cursor)
 
 
 # —――――――――――――――――――――――――――――――――
 # Events, Lineups, Stats, H2H
 
+def _tracked(endpoint: str, fixture_id: int, cache_key: str) -> Optional[Dict[str, Any]]:
+    data = final_cache.get(cache_key) or inplay_cache.get(cache_key)
+    if data is not None:
+        record_hit(endpoint, {"fixture": fixture_id})
+    return data
+
 async def get_events(fixture_id: int) -> Dict[str, Any]:
+    tracked = _tracked("fixtures/events", fixture_id, f"events_{fixture_id}")
+    if tracked is not None:
+        return tracked
     return await fetch(
         "fixtures/events",
         params={"fixture": fixture_id},
@@ -124,6 +344,9 @@ async def get_lineups(fixture_id: int) -> Dict[str, Any]:
     )
 
 async def get_fixture_statistics(fixture_id: int) -> Dict[str, Any]:
+    tracked = _tracked("fixtures/statistics", fixture_id, f"statistics_{fixture_id}")
+    if tracked is not None:
+        return tracked
     return await fetch(
         "fixtures/statistics",
         params={"fixture": fixture_id},
@@ -200,12 +423,37 @@ async def get_leagues() -> Dict[str, Any]:
 async def get_leagues_seasons() -> Dict[str, Any]:
     return await fetch("leagues/seasons", cache=general_cache, cache_key="seasons")
 
-async def get_standings(league_id: int) -> Dict[str, Any]:
+
+# —――――――――――――――――――――――――――――――――
+# Season resolution: league id -> current season, indexed from the cached
+# `leagues` payload and rebuilt only when that payload is refetched
+
+_current_seasons: Dict[int, int] = {}
+_current_seasons_source: Optional[Dict[str, Any]] = None
+
+def _index_current_seasons(leagues: Dict[str, Any]) -> None:
+    global _current_seasons, _current_seasons_source
+    index: Dict[int, int] = {}
+    for lg in leagues.get("response", []):
+        seasons = lg.get("seasons") or []
+        current = [s["year"] for s in seasons if s.get("current")]
+        if current or seasons:
+            index[lg["league"]["id"]] = current[0] if current else seasons[-1]["year"]
+    _current_seasons, _current_seasons_source = index, leagues
+
+async def resolve_season(league_id: int) -> int:
+    leagues = await get_leagues()
+    if leagues is not _current_seasons_source and not leagues.get("errors"):
+        _index_current_seasons(leagues)
+    return _current_seasons.get(league_id, date.today().year)
+
+async def get_standings(league_id: int, season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "standings",
-        params={"league": league_id, "season": date.today().year},
+        params={"league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"standings_{league_id}"
+        cache_key=f"standings_{league_id}_{season}"
     )
 
 
@@ -221,12 +469,14 @@ async def get_teams(country: Optional[str] = None,
     key = f"teams_{country}_{league_id}_{season}"
     return await fetch("teams", params=params, cache=general_cache, cache_key=key)
 
-async def get_team_statistics(team_id: int, league_id: int) -> Dict[str, Any]:
+async def get_team_statistics(team_id: int, league_id: int,
+                              season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "teams/statistics",
-        params={"team": team_id, "league": league_id, "season": date.today().year},
+        params={"team": team_id, "league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"team_stats_{team_id}_{league_id}"
+        cache_key=f"team_stats_{team_id}_{league_id}_{season}"
     )
 
 async def get_teams_countries() -> Dict[str, Any]:
@@ -240,44 +490,50 @@ async def get_players(team_id: int, season: int) -> Dict[str, Any]:
         cache_key=f"players_{team_id}_{season}"
     )
 
-async def get_player_statistics(player_id: int, league_id: int) -> Dict[str, Any]:
+async def get_player_statistics(player_id: int, league_id: int,
+                                season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "players/statistics",
-        params={"player": player_id, "league": league_id, "season": date.today().year},
+        params={"player": player_id, "league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"player_stats_{player_id}_{league_id}"
+        cache_key=f"player_stats_{player_id}_{league_id}_{season}"
     )
 
-async def get_topscorers(league_id: int) -> Dict[str, Any]:
+async def get_topscorers(league_id: int, season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "players/topscorers",
-        params={"league": league_id, "season": date.today().year},
+        params={"league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"topscorers_{league_id}"
+        cache_key=f"topscorers_{league_id}_{season}"
     )
 
-async def get_topassists(league_id: int) -> Dict[str, Any]:
+async def get_topassists(league_id: int, season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "players/topassists",
-        params={"league": league_id, "season": date.today().year},
+        params={"league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"topassists_{league_id}"
+        cache_key=f"topassists_{league_id}_{season}"
     )
 
-async def get_topyellowcards(league_id: int) -> Dict[str, Any]:
+async def get_topyellowcards(league_id: int, season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "players/topyellowcards",
-        params={"league": league_id, "season": date.today().year},
+        params={"league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"topyellow_{league_id}"
+        cache_key=f"topyellow_{league_id}_{season}"
     )
 
-async def get_topredcards(league_id: int) -> Dict[str, Any]:
+async def get_topredcards(league_id: int, season: Optional[int] = None) -> Dict[str, Any]:
+    season = season or await resolve_season(league_id)
     return await fetch(
         "players/topredcards",
-        params={"league": league_id, "season": date.today().year},
+        params={"league": league_id, "season": season},
         cache=general_cache,
-        cache_key=f"topred_{league_id}"
+        cache_key=f"topred_{league_id}_{season}"
     )
 
 async def get_squad(team_id: int, season: int) -> Dict[str, Any]:
@@ -331,9 +587,11 @@ async def get_trophies(players: Optional[str] = None,
     key = f"trophies_{players}_{coaches}"
     return await fetch("trophies", params=params, cache=general_cache, cache_key=key)
 
-async def get_predictions_by_date(date_str: str) -> Dict[str, Any]:
+async def get_predictions_by_date(date_str: str, query: Optional[FixtureQuery] = None) -> Dict[str, Any]:
     raw = await get_raw_fixtures(date_str)
-    resp = raw.get("response", [])
+    resp, next_cursor = raw.get("response", []), None
+    if query is not None:
+        resp, next_cursor = query.select(resp)
     results = []
     for fx in resp:
         fid = fx["fixture"]["id"]
@@ -345,11 +603,15 @@ async def get_predictions_by_date(date_str: str) -> Dict[str, Any]:
             "predictions": pred.get("response", [])
         }
         results.append(fx_pred)
+    if query is not None:
+        return query.envelope(results, next_cursor)
     return {"response": results}
 
-async def get_odds_by_date(date_str: str) -> Dict[str, Any]:
+async def get_odds_by_date(date_str: str, query: Optional[FixtureQuery] = None) -> Dict[str, Any]:
     raw = await get_raw_fixtures(date_str)
-    resp = raw.get("response", [])
+    resp, next_cursor = raw.get("response", []), None
+    if query is not None:
+        resp, next_cursor = query.select(resp)
     results = []
     for fx in resp:
         fid = fx["fixture"]["id"]
@@ -361,6 +623,8 @@ async def get_odds_by_date(date_str: str) -> Dict[str, Any]:
             "odds": odds.get("response", [])
         }
         results.append(fx_odds)
+    if query is not None:
+        return query.envelope(results, next_cursor)
     return {"response": results}
 
 async def get_comparison_by_date(date_str: str):
@@ -391,21 +655,20 @@ async def get_home_draw_away(fixture_id: int) -> Dict[str, Any]:
     odds = await get_odds_cached(fixture_id)
     return {"response": odds.get("response", [])}
 
+async def _prediction(fixture_id: int) -> Dict[str, Any]:
+    # the `predictions` block of the (slimmed) cached predictions payload
+    resp = (await get_predictions_cached(fixture_id)).get("response") or [{}]
+    return resp[0].get("predictions") or {}
+
 async def get_btts(fixture_id: int) -> Dict[str, Any]:
-    predictions = await get_predictions_cached(fixture_id)
-    btts = predictions.get("response", [{}])[0].get("predictions", {}).get("both_teams_to_score")
-    return {"btts": btts}
+    return {"btts": (await _prediction(fixture_id)).get("both_teams_to_score")}
 
 async def get_goals_over_under(fixture_id: int) -> Dict[str, Any]:
-    predictions = await get_predictions_cached(fixture_id)
-    goals = predictions.get("response", [{}])[0].get("predictions", {}).get("goals")
-    return {"goals": goals}
+    return {"goals": (await _prediction(fixture_id)).get("goals")}
 
 async def get_cards_corners(fixture_id: int) -> Dict[str, Any]:
-    predictions = await get_predictions_cached(fixture_id)
-    corners = predictions.get("response", [{}])[0].get("predictions", {}).get("corners")
-    cards = predictions.get("response", [{}])[0].get("predictions", {}).get("cards")
-    return {"corners": corners, "cards": cards}
+    prediction = await _prediction(fixture_id)
+    return {"corners": prediction.get("corners"), "cards": prediction.get("cards")}
 
 async def get_historical_results(team_id: int, season: int) -> Dict[str, Any]:
     return await fetch(
@@ -463,3 +726,78 @@ async def get_btts_odds_by_date(date_str: str) -> Dict[str, List[Dict[str, Any]]
         })
 
     return {"response": results}
+
+# ─── Value Bets by Date ────────────────────────────────────────────────────────
+
+_OUTCOMES = ("home", "draw", "away")
+_MATCH_WINNER = {"Home": "home", "Draw": "draw", "Away": "away"}
+
+
+def _percent(value: Any) -> Optional[float]:
+    try:
+        return float(str(value).rstrip("%")) / 100.0
+    except (TypeError, ValueError):
+        return None
+
+
+def _best_match_winner_prices(odds_list: List[Dict[str, Any]]) -> Dict[str, float]:
+    # best Match Winner (bet id=1) price per outcome across all bookmakers
+    best: Dict[str, float] = {}
+    for item in odds_list:
+        for bm in item.get("bookmakers", []):
+            for bet in bm.get("bets", []):
+                if bet.get("id") != 1:
+                    continue
+                for val in bet.get("values", []):
+                    outcome = _MATCH_WINNER.get(val.get("value"))
+                    try:
+                        odd = float(val["odd"])
+                    except (KeyError, TypeError, ValueError):
+                        continue
+                    if outcome and odd > best.get(outcome, 0.0):
+                        best[outcome] = odd
+    return best
+
+
+async def get_value_bets_by_date(date_str: str, threshold: float = 1.05) -> Dict[str, Any]:
+    """
+    Join predicted home/draw/away percentages with the best Match Winner
+    price for every fixture on `date_str` and return the outcomes whose
+    expected value (probability × price) exceeds `threshold`, best first.
+    """
+    raw = await get_raw_fixtures(date_str)
+    fixtures = raw.get("response", [])
+    if not fixtures:
+        return {"response": []}
+
+    # one concurrent fan-out for the whole day instead of a sequential loop
+    fids = [fx["fixture"]["id"] for fx in fixtures]
+    preds, odds = await asyncio.gather(
+        asyncio.gather(*(get_predictions_cached(fid) for fid in fids)),
+        asyncio.gather(*(get_odds_cached(fid) for fid in fids)),
+    )
+
+    results: List[Dict[str, Any]] = []
+    for fx, pred, odd in zip(fixtures, preds, odds):
+        pred_resp = pred.get("response") or [{}]
+        percent = pred_resp[0].get("predictions", {}).get("percent") or {}
+        prices = _best_match_winner_prices(odd.get("response", []))
+        for outcome in _OUTCOMES:
+            prob = _percent(percent.get(outcome))
+            price = prices.get(outcome)
+            if not prob or not price:
+                continue
+            value = prob * price
+            if value > threshold:
+                results.append({
+                    "fixture": fx["fixture"],
+                    "league":  fx["league"],
+                    "teams":   fx["teams"],
+                    "outcome": outcome,
+                    "probability": prob,
+                    "odd":     price,
+                    "value":   round(value, 4),
+                })
+
+    results.sort(key=lambda r: r["value"], reverse=True)
+    return {"response": results}
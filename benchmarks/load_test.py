@@ -0,0 +1,140 @@
+"""
+Offline load test: the FastAPI app and a mock API-Football upstream
+(benchmarks.mock_upstream) in one process, no key or network needed:
+
+    python -m benchmarks.load_test [--fixtures 300] [--latency 0.05] [--error-rate 0]
+                                   [--requests 200] [--concurrency 20] [--only NAME]
+
+For each scenario it reports throughput, p50/p99 latency, non-200
+responses, upstream calls made and the process's peak RSS so far. "cold"
+scenarios clear every cache before each request; "warm" ones run against
+caches filled by one priming request.
+"""
+import argparse
+import asyncio
+import resource
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+import api_football
+from benchmarks.mock_upstream import MockUpstream
+from fixture_index import fixture_index
+from standings import standings_snapshot
+
+
+def reset_caches() -> None:
+    for cache in (api_football.fixture_cache, api_football.predictions_cache,
+                  api_football.odds_cache, api_football.general_cache,
+                  api_football.inplay_cache, api_football.final_cache):
+        cache.clear()
+    fixture_index.clear()
+    standings_snapshot.tables.clear()
+    standings_snapshot.refreshed_at = None
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values: List[float], p: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run_scenario(client: httpx.AsyncClient, mock: MockUpstream, name: str, path: str,
+                       requests: int, concurrency: int, cold: bool) -> Dict[str, Any]:
+    reset_caches()
+    if not cold:
+        await client.get(path)
+    mock.reset()
+
+    latencies: List[float] = []
+    errors = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            queue.get_nowait()
+            if cold:
+                reset_caches()
+            t0 = time.perf_counter()
+            resp = await client.get(path)
+            latencies.append(time.perf_counter() - t0)
+            if resp.status_code != 200:
+                errors += 1
+
+    # cold requests share nothing, so they run one at a time
+    workers = 1 if cold else concurrency
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - started
+    return {
+        "name": name,
+        "requests": requests,
+        "rps": requests / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "errors": errors,
+        "upstream": mock.total_calls,
+        "rss_mb": peak_rss_mb(),
+    }
+
+
+async def run(args: argparse.Namespace) -> None:
+    from main import app
+
+    mock = MockUpstream(args.fixtures, args.latency, args.jitter, args.error_rate)
+    await api_football.start_client(httpx.ASGITransport(app=mock))
+    # the app's lifespan (live feed, standings refresher) is deliberately not run
+    client = httpx.AsyncClient(
+        base_url="http://bench", transport=httpx.ASGITransport(app=app), timeout=300.0
+    )
+
+    today = date.today().isoformat()
+    cold_requests = max(1, args.requests // 20)
+    scenarios = [
+        ("fixtures_today_cold", "/fixtures/today", cold_requests, True),
+        ("fixtures_today_warm", "/fixtures/today", args.requests, False),
+        ("full_details_cold", f"/fixtures/full-details?date={today}", 1, True),
+        ("full_details_warm", f"/fixtures/full-details?date={today}", args.requests, False),
+        ("value_bets_cold", f"/value-bets?date={today}", cold_requests, True),
+        ("value_bets_warm", f"/value-bets?date={today}", args.requests, False),
+        ("standings_all_cold", "/standings/all", cold_requests, True),
+        ("standings_all_warm", "/standings/all", args.requests, False),
+    ]
+    print(f"{args.fixtures} fixtures/day, upstream latency {args.latency * 1000:.0f}"
+          f"+{args.jitter * 1000:.0f} ms, error rate {args.error_rate:.1%}")
+    print(f"{'scenario':<22}{'reqs':>6}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}"
+          f"{'non-200':>9}{'upstream':>10}{'peak RSS MB':>13}")
+    for name, path, requests, cold in scenarios:
+        if args.only and args.only not in name:
+            continue
+        r = await run_scenario(client, mock, name, path, requests, args.concurrency, cold)
+        print(f"{r['name']:<22}{r['requests']:>6}{r['rps']:>9.1f}{r['p50_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+              f"{r['errors']:>9}{r['upstream']:>10}{r['rss_mb']:>13.1f}")
+
+    await client.aclose()
+    await api_football.close_client()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--only", help="run only scenarios whose name contains this")
+    asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
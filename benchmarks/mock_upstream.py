@@ -0,0 +1,147 @@
+"""
+Local stand-in for API-Football v3 serving synthetic payloads from
+benchmarks.payloads, with configurable latency and error rate and a
+per-endpoint call counter. Used in-process by benchmarks.load_test, or
+standalone:
+
+    python -m benchmarks.mock_upstream [--port 9000] [--latency 0.05] [--error-rate 0.01]
+"""
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import date, datetime, time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from benchmarks import payloads
+from query import TIMEZONE
+
+RATE_LIMIT_HEADERS = {
+    "x-ratelimit-requests-limit": "75000",
+    "x-ratelimit-requests-remaining": "75000",
+    "x-ratelimit-limit": "450",
+    "x-ratelimit-remaining": "450",
+}
+
+
+def _day_start(date_str: str) -> int:
+    d = date.fromisoformat(date_str)
+    return int(datetime.combine(d, time.min, TIMEZONE).timestamp())
+
+
+class MockUpstream:
+    """
+    ASGI app answering `GET /<endpoint>?<params>` like API-Football. Bodies
+    are built once per (endpoint, params) and served from memory, so the
+    mock costs little CPU next to the app under test.
+    """
+
+    def __init__(self, fixtures: int = 300, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.calls: Counter = Counter()
+        self._bodies: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], bytes] = {}
+        self._handlers: Dict[str, Callable[[Dict[str, str]], Any]] = {
+            "fixtures":            self._fixtures,
+            "fixtures/events":     lambda p: self._fixture(p)["events"],
+            "fixtures/lineups":    lambda p: [],
+            "fixtures/statistics": lambda p: [],
+            "fixtures/headtohead": self._h2h,
+            "predictions":         lambda p: payloads.predictions(int(p["fixture"])),
+            "odds":                lambda p: payloads.odds(int(p["fixture"])) if "fixture" in p else [],
+            "odds/live":           lambda p: [item for fx in self._live() for item in payloads.odds(fx["fixture"]["id"])],
+            "odds/live/bets":      lambda p: [{"id": 1, "name": "Match Winner"}],
+            "leagues":             lambda p: payloads.leagues(300),
+            "standings":           lambda p: payloads.standings(int(p["league"])),
+            "teams":               lambda p: [{"team": {"id": int(p.get("league", 0)) * 100 + i}} for i in range(1, 21)],
+            "teams/statistics":    lambda p: {"team": {"id": int(p["team"])}, "league": {"id": int(p["league"])}},
+        }
+        self.app = Starlette(routes=[Route("/{endpoint:path}", self.handle)])
+
+    async def __call__(self, scope, receive, send):
+        await self.app(scope, receive, send)
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset(self) -> None:
+        self.calls.clear()
+
+    # payloads
+
+    def _day(self, date_str: str) -> List[Dict[str, Any]]:
+        start = _day_start(date_str)
+        day = payloads.fixtures_day(self.fixtures, seed=self.seed + start, start_id=start // 100)
+        for fx in day:
+            fx["fixture"]["timestamp"] = start + (fx["fixture"]["id"] % 48) * 1800
+            fx["fixture"]["date"] = datetime.fromtimestamp(fx["fixture"]["timestamp"], TIMEZONE).isoformat()
+        return day
+
+    def _live(self) -> List[Dict[str, Any]]:
+        return [fx for fx in self._day(date.today().isoformat()) if fx["fixture"]["status"]["short"] in ("1H", "HT", "2H")]
+
+    def _fixture(self, params: Dict[str, str]) -> Dict[str, Any]:
+        return payloads.fixture(int(params.get("fixture") or params["id"]))
+
+    def _fixtures(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        if "date" in params:
+            return self._day(params["date"])
+        if params.get("live"):
+            return self._live()
+        if "id" in params:
+            return [self._fixture(params)]
+        return []
+
+    def _h2h(self, params: Dict[str, str]) -> List[Dict[str, Any]]:
+        home = int(params["h2h"].split("-")[0])
+        return [payloads.fixture(home * 10 + i, status="FT") for i in range(5)]
+
+    def body(self, endpoint: str, params: Dict[str, str]) -> bytes:
+        key = (endpoint, tuple(sorted(params.items())))
+        body = self._bodies.get(key)
+        if body is None:
+            handler = self._handlers.get(endpoint)
+            response = handler(params) if handler else []
+            body = self._bodies[key] = orjson.dumps(payloads.envelope(endpoint, params, response))
+        return body
+
+    async def handle(self, request: Request) -> Response:
+        endpoint = request.path_params["endpoint"]
+        self.calls[endpoint] += 1
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            return Response(b"upstream error", status_code=500)
+        body = self.body(endpoint, dict(request.query_params))
+        return Response(body, media_type="application/json", headers=RATE_LIMIT_HEADERS)
+
+
+def main(argv: Optional[List[str]] = None):
+    import uvicorn
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--fixtures", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    mock = MockUpstream(args.fixtures, args.latency, args.jitter, args.error_rate)
+    uvicorn.run(mock, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Decode+encode throughput and memory of a full day of enriched fixtures:
+
+    python -m benchmarks.models_bench [--fixtures 800] [--rounds 5]
+
+dict      orjson.loads -> jsonable_encoder -> orjson.dumps (untyped route path)
+convert   orjson.loads -> msgspec.convert into structs.FixturesEnvelope -> encode
+          (what TYPED_RESPONSES=1 ships: typed_response converts the cached dict)
+structs   msgspec decode straight from bytes into structs.FixturesEnvelope -> encode
+pydantic  models.FixturesResponse.parse_raw -> .json()
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+import msgspec
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks import payloads
+from models import FixturesResponse
+from structs import FixturesEnvelope, decode, encode
+
+
+def build_raw(n: int) -> bytes:
+    day = payloads.fixtures_day(n)
+    for fx in day:
+        fid = fx["fixture"]["id"]
+        fx["predictions"] = payloads.predictions(fid)
+        fx["odds"] = payloads.odds(fid)
+    return orjson.dumps({"response": day})
+
+
+PATHS = {
+    "dict": (
+        orjson.loads,
+        lambda obj: orjson.dumps(jsonable_encoder(obj)),
+    ),
+    "convert": (
+        lambda raw: msgspec.convert(orjson.loads(raw), FixturesEnvelope),
+        encode,
+    ),
+    "structs": (
+        lambda raw: decode(raw, FixturesEnvelope),
+        encode,
+    ),
+    "pydantic": (
+        FixturesResponse.parse_raw,
+        lambda obj: obj.json(by_alias=True).encode(),
+    ),
+}
+
+
+def measure(name: str, raw: bytes, rounds: int) -> dict:
+    decode_fn, encode_fn = PATHS[name]
+
+    gc.collect()
+    tracemalloc.start()
+    obj = decode_fn(raw)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    dec = enc = 0.0
+    size = 0
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        obj = decode_fn(raw)
+        t1 = time.perf_counter()
+        out = encode_fn(obj)
+        t2 = time.perf_counter()
+        dec += t1 - t0
+        enc += t2 - t1
+        size = len(out)
+    return {
+        "path": name,
+        "decode_ms": dec / rounds * 1000,
+        "encode_ms": enc / rounds * 1000,
+        "mb_per_s": len(raw) / ((dec + enc) / rounds) / 1e6,
+        "retained_mb": retained / 1e6,
+        "out_kb": size / 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", type=int, default=800)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    raw = build_raw(args.fixtures)
+    print(f"{args.fixtures} fixtures, {len(raw) / 1e6:.1f} MB of upstream JSON")
+    print(f"{'path':<10}{'decode ms':>11}{'encode ms':>11}{'MB/s':>9}{'retained MB':>13}{'out KB':>10}")
+    for name in PATHS:
+        r = measure(name, raw, args.rounds)
+        print(f"{r['path']:<10}{r['decode_ms']:>11.1f}{r['encode_ms']:>11.1f}"
+              f"{r['mb_per_s']:>9.1f}{r['retained_mb']:>13.1f}{r['out_kb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
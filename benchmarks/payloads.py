@@ -0,0 +1,137 @@
+import random
+from typing import Any, Dict, List
+
+# Synthetic API-Football v3 payloads shaped like the real responses.
+
+STATUSES = ["NS", "NS", "NS", "1H", "HT", "2H", "FT"]
+LEAGUES = [(39, "Premier League", "England"), (140, "La Liga", "Spain"),
+           (135, "Serie A", "Italy"), (78, "Bundesliga", "Germany"),
+           (61, "Ligue 1", "France"), (286, "Super Liga", "Serbia")]
+BASE_TS = 1747000000
+
+
+def envelope(endpoint: str, params: Dict[str, Any], response: Any) -> Dict[str, Any]:
+    return {
+        "get": endpoint,
+        "parameters": params,
+        "errors": [],
+        "results": len(response) if isinstance(response, list) else 1,
+        "paging": {"current": 1, "total": 1},
+        "response": response,
+    }
+
+
+def event(rng: random.Random, home_id: int, away_id: int) -> Dict[str, Any]:
+    return {
+        "time": {"elapsed": rng.randint(1, 90), "extra": None},
+        "team": {"id": rng.choice([home_id, away_id]), "name": "Team", "logo": "https://media.api-sports.io/football/teams/1.png"},
+        "player": {"id": rng.randint(1, 50000), "name": "Player Name"},
+        "assist": {"id": None, "name": None},
+        "type": rng.choice(["Goal", "Card", "subst"]),
+        "detail": rng.choice(["Normal Goal", "Yellow Card", "Substitution 1"]),
+        "comments": None,
+    }
+
+
+def fixture(fid: int, rng: random.Random = None, status: str = None) -> Dict[str, Any]:
+    rng = rng or random.Random(fid)
+    league_id, league_name, country = LEAGUES[fid % len(LEAGUES)]
+    home_id, away_id = fid * 2, fid * 2 + 1
+    status = status or rng.choice(STATUSES)
+    started = status != "NS"
+    goals = {"home": rng.randint(0, 3), "away": rng.randint(0, 3)} if started else {"home": None, "away": None}
+    return {
+        "fixture": {
+            "id": fid,
+            "referee": "Referee Name",
+            "timezone": "Europe/Belgrade",
+            "date": "2025-05-11T18:00:00+02:00",
+            "timestamp": BASE_TS + (fid % 48) * 1800,
+            "periods": {"first": BASE_TS if started else None, "second": None},
+            "venue": {"id": 500 + fid % 300, "name": "Stadium", "city": "City"},
+            "status": {"long": "Match", "short": status, "elapsed": 60 if started else None},
+        },
+        "league": {
+            "id": league_id, "name": league_name, "country": country,
+            "logo": f"https://media.api-sports.io/football/leagues/{league_id}.png",
+            "flag": "https://media.api-sports.io/flags/gb.svg",
+            "season": 2024, "round": "Regular Season - 36",
+        },
+        "teams": {
+            "home": {"id": home_id, "name": f"Home {fid}", "logo": f"https://media.api-sports.io/football/teams/{home_id}.png", "winner": None},
+            "away": {"id": away_id, "name": f"Away {fid}", "logo": f"https://media.api-sports.io/football/teams/{away_id}.png", "winner": None},
+        },
+        "goals": goals,
+        "score": {"halftime": goals, "fulltime": goals, "extratime": {"home": None, "away": None}, "penalty": {"home": None, "away": None}},
+        "events": [event(rng, home_id, away_id) for _ in range(rng.randint(0, 12) if started else 0)],
+    }
+
+
+def fixtures_day(n: int, seed: int = 0, start_id: int = 1000000) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    return [fixture(start_id + i, rng) for i in range(n)]
+
+
+def odds(fid: int, bookmakers: int = 4) -> List[Dict[str, Any]]:
+    rng = random.Random(fid)
+    fx = fixture(fid)
+
+    def bet(bid: int, name: str, outcomes: List[str]) -> Dict[str, Any]:
+        return {"id": bid, "name": name, "values": [
+            {"value": o, "odd": f"{rng.uniform(1.2, 6.0):.2f}"} for o in outcomes
+        ]}
+
+    return [{
+        "league": fx["league"],
+        "fixture": {k: fx["fixture"][k] for k in ("id", "timezone", "date", "timestamp")},
+        "update": "2025-05-11T10:00:00+00:00",
+        "bookmakers": [
+            {"id": b, "name": f"Bookmaker {b}", "bets": [
+                bet(1, "Match Winner", ["Home", "Draw", "Away"]),
+                bet(5, "Goals Over/Under", ["Over 2.5", "Under 2.5", "Over 1.5", "Under 1.5"]),
+                bet(8, "Both Teams Score", ["Yes", "No"]),
+            ]}
+            for b in range(1, bookmakers + 1)
+        ],
+    }]
+
+
+def predictions(fid: int) -> List[Dict[str, Any]]:
+    rng = random.Random(fid)
+    fx = fixture(fid)
+    home = rng.randint(10, 70)
+    draw = rng.randint(5, 100 - home)
+    return [{
+        "predictions": {
+            "winner": {"id": fx["teams"]["home"]["id"], "name": fx["teams"]["home"]["name"], "comment": "Win or draw"},
+            "win_or_draw": True,
+            "under_over": "-3.5",
+            "goals": {"home": "-2.5", "away": "-1.5"},
+            "advice": "Double chance : home or draw",
+            "percent": {"home": f"{home}%", "draw": f"{draw}%", "away": f"{100 - home - draw}%"},
+        },
+        "league": fx["league"],
+        "teams": fx["teams"],
+        "comparison": {k: {"home": "55%", "away": "45%"} for k in ("form", "att", "def", "poisson_distribution", "h2h", "goals", "total")},
+        # the real payload carries the full recent h2h fixtures
+        "h2h": [fixture(fid + 100000 + i, status="FT") for i in range(8)],
+    }]
+
+
+def leagues(n: int = 1000) -> List[Dict[str, Any]]:
+    return [{
+        "league": {"id": i, "name": f"League {i}", "type": "League", "logo": ""},
+        "country": {"name": "Country", "code": "CC", "flag": ""},
+        "seasons": [{"year": 2023, "current": False}, {"year": 2024, "current": True}],
+    } for i in range(1, n + 1)]
+
+
+def standings(league_id: int, teams: int = 20) -> List[Dict[str, Any]]:
+    return [{"league": {
+        "id": league_id, "season": 2024,
+        "standings": [[{
+            "rank": r, "team": {"id": league_id * 100 + r, "name": f"Team {r}"},
+            "points": 90 - r * 3, "goalsDiff": 40 - r * 4, "form": "WWDLW",
+            "all": {"played": 36, "win": 20, "draw": 5, "lose": 11, "goals": {"for": 60, "against": 40}},
+        } for r in range(1, teams + 1)]],
+    }}]
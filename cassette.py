@@ -0,0 +1,134 @@
+import asyncio
+import gzip
+import hashlib
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+import orjson
+
+# live   -> talk to API-Football
+# record -> talk to API-Football and write every request/response pair to CASSETTE_DIR
+# replay -> serve _client calls from CASSETTE_DIR only, never spending quota
+UPSTREAM_MODE = os.getenv("UPSTREAM_MODE", "live")
+CASSETTE_DIR = os.getenv("CASSETTE_DIR", "cassettes")
+# 1.0 replays each response after its recorded duration, 0 without delay
+CASSETTE_SPEED = float(os.getenv("CASSETTE_SPEED", "1.0"))
+
+# body is stored decoded, so transport-level headers no longer apply
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def request_key(request: httpx.Request) -> Tuple[str, str]:
+    """(endpoint, file stem): params are sorted so their order doesn't matter."""
+    endpoint = request.url.path.strip("/")
+    params = sorted(request.url.params.multi_items())
+    digest = hashlib.sha1(orjson.dumps([endpoint, params])).hexdigest()[:20]
+    return endpoint, digest
+
+
+class CassetteTransport(httpx.AsyncBaseTransport):
+    """
+    Records upstream traffic to, or replays it from, a directory of gzip
+    JSON-lines files, one per endpoint+params under `<dir>/<endpoint>/`,
+    with `index.jsonl` listing every recorded key. A key requested several
+    times is recorded several times and replayed in the same order (the
+    last recording repeats once they run out), so a day's live polling
+    plays back as it happened. Requests with no recording get a 404.
+    """
+
+    def __init__(self, mode: str, directory: str = CASSETTE_DIR,
+                 inner: Optional[httpx.AsyncBaseTransport] = None, speed: float = CASSETTE_SPEED):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown cassette mode: {mode!r}")
+        self.mode = mode
+        self.directory = directory
+        self.inner = inner
+        self.speed = speed
+        self._indexed: Set[str] = set()
+        if mode == "record":
+            # recording into an existing cassette extends it
+            try:
+                with open(os.path.join(directory, "index.jsonl"), "rb") as f:
+                    self._indexed = {orjson.loads(line)["file"] for line in f if line.strip()}
+            except FileNotFoundError:
+                pass
+        self._tapes: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        self._played: Dict[Tuple[str, str], int] = {}
+
+    def _path(self, endpoint: str, stem: str) -> str:
+        return os.path.join(self.directory, endpoint, stem + ".jsonl.gz")
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self.mode == "record":
+            return await self._record(request)
+        return await self._replay(request)
+
+    async def _record(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        elapsed = time.perf_counter() - started
+        await response.aclose()
+
+        endpoint, stem = request_key(request)
+        path = self._path(endpoint, stem)
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _DROP_HEADERS]
+        entry = {"status": response.status_code, "headers": headers,
+                 "elapsed": elapsed, "body": body.decode("utf-8", "replace")}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # every append is its own gzip member; readers see one stream
+        with gzip.open(path, "ab") as f:
+            f.write(orjson.dumps(entry) + b"\n")
+        file = os.path.relpath(path, self.directory)
+        if file not in self._indexed:
+            with open(os.path.join(self.directory, "index.jsonl"), "ab") as f:
+                f.write(orjson.dumps({
+                    "endpoint": endpoint,
+                    "params": sorted(request.url.params.multi_items()),
+                    "file": file,
+                }) + b"\n")
+            self._indexed.add(file)
+
+        return httpx.Response(response.status_code, headers=headers, content=body, request=request)
+
+    def _tape(self, key: Tuple[str, str]) -> List[Dict[str, Any]]:
+        tape = self._tapes.get(key)
+        if tape is None:
+            try:
+                with gzip.open(self._path(*key), "rb") as f:
+                    tape = [orjson.loads(line) for line in f if line.strip()]
+            except FileNotFoundError:
+                tape = []
+            self._tapes[key] = tape
+        return tape
+
+    async def _replay(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request)
+        tape = self._tape(key)
+        if not tape:
+            return httpx.Response(404, json={"errors": {"cassette": f"no recording for {request.url}"}},
+                                  request=request)
+        played = self._played.get(key, 0)
+        self._played[key] = played + 1
+        entry = tape[min(played, len(tape) - 1)]
+        if self.speed:
+            await asyncio.sleep(entry["elapsed"] * self.speed)
+        return httpx.Response(entry["status"], headers=entry["headers"],
+                              content=entry["body"].encode(), request=request)
+
+    async def aclose(self) -> None:
+        if self.inner is not None:
+            await self.inner.aclose()
+
+
+def make_transport(http2: bool = True,
+                   limits: Optional[httpx.Limits] = None) -> Optional[httpx.AsyncBaseTransport]:
+    """The upstream transport for UPSTREAM_MODE; None means httpx's default."""
+    if UPSTREAM_MODE == "live":
+        return None
+    inner = None
+    if UPSTREAM_MODE == "record":
+        inner = httpx.AsyncHTTPTransport(http2=http2, limits=limits or httpx.Limits())
+    return CassetteTransport(UPSTREAM_MODE, CASSETTE_DIR, inner)
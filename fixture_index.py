@@ -0,0 +1,127 @@
+import os
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# well above the widest /fixtures/window (14 days), so concurrent windows
+# can't evict the dates a request just loaded before it reads them
+MAX_INDEXED_DATES = int(os.getenv("FIXTURE_INDEX_DATES", "60"))
+
+
+class FixtureIndex:
+    """
+    In-memory secondary indexes over the raw `fixtures?date=` payloads:
+    league/team/status -> fixture ids plus a kickoff-sorted list for time
+    windows. A date is re-indexed only when a new payload for it is cached
+    (identity check), so cache hits cost nothing; the oldest dates are
+    dropped beyond `max_dates`.
+    """
+
+    def __init__(self, max_dates: int = MAX_INDEXED_DATES):
+        self.max_dates = max_dates
+        self.fixtures: Dict[int, Dict[str, Any]] = {}
+        self.by_league: Dict[int, Set[int]] = {}
+        self.by_team: Dict[int, Set[int]] = {}
+        self.by_status: Dict[str, Set[int]] = {}
+        self._kickoffs: List[Tuple[int, int]] = []
+        self._payloads: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._date_ids: Dict[str, Set[int]] = {}
+
+    def ingest(self, date_str: str, payload: Dict[str, Any]) -> None:
+        if self._payloads.get(date_str) is payload:
+            return
+        self._drop_date(date_str)
+        ids: Set[int] = set()
+        for fx in payload.get("response", []):
+            fid = fx["fixture"]["id"]
+            if fid in self.fixtures:
+                # rescheduled into another date's payload
+                self._remove(fid)
+            self._add(fx)
+            ids.add(fid)
+        self._payloads[date_str] = payload
+        self._date_ids[date_str] = ids
+        while len(self._payloads) > self.max_dates:
+            self._drop_date(next(iter(self._payloads)))
+
+    def clear(self) -> None:
+        for date_str in list(self._payloads):
+            self._drop_date(date_str)
+
+    def has_date(self, date_str: str) -> bool:
+        return date_str in self._payloads
+
+    def lookup(
+        self,
+        start_ts: int,
+        end_ts: int,
+        leagues: Optional[Iterable[int]] = None,
+        team: Optional[int] = None,
+        status: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """Fixtures kicking off in [start_ts, end_ts], sorted by kickoff."""
+        lo = bisect_left(self._kickoffs, (start_ts, -1))
+        hi = bisect_right(self._kickoffs, (end_ts, float("inf")))
+        candidates = [fid for _, fid in self._kickoffs[lo:hi]]
+
+        sets: List[Set[int]] = []
+        if leagues:
+            sets.append(set().union(*(self.by_league.get(l, set()) for l in leagues)))
+        if team is not None:
+            sets.append(self.by_team.get(team, set()))
+        if status:
+            sets.append(set().union(*(self.by_status.get(s, set()) for s in status)))
+        if sets:
+            allowed = set.intersection(*sets)
+            candidates = [fid for fid in candidates if fid in allowed]
+        return [self.fixtures[fid] for fid in candidates]
+
+    # —――――――――――――――――――――――――――――――――
+
+    @staticmethod
+    def _keys(fx: Dict[str, Any]) -> Tuple[int, List[int], str, Tuple[int, int]]:
+        fid = fx["fixture"]["id"]
+        teams = fx.get("teams", {})
+        team_ids = [t["id"] for t in (teams.get("home"), teams.get("away")) if t and t.get("id")]
+        status = fx["fixture"].get("status", {}).get("short") or ""
+        return fx.get("league", {}).get("id"), team_ids, status, (fx["fixture"].get("timestamp") or 0, fid)
+
+    def _add(self, fx: Dict[str, Any]) -> None:
+        fid = fx["fixture"]["id"]
+        league_id, team_ids, status, kickoff = self._keys(fx)
+        self.fixtures[fid] = fx
+        self.by_league.setdefault(league_id, set()).add(fid)
+        for tid in team_ids:
+            self.by_team.setdefault(tid, set()).add(fid)
+        self.by_status.setdefault(status, set()).add(fid)
+        insort(self._kickoffs, kickoff)
+
+    def _remove(self, fid: int) -> None:
+        fx = self.fixtures.pop(fid)
+        league_id, team_ids, status, kickoff = self._keys(fx)
+        self._discard(self.by_league, league_id, fid)
+        for tid in team_ids:
+            self._discard(self.by_team, tid, fid)
+        self._discard(self.by_status, status, fid)
+        i = bisect_left(self._kickoffs, kickoff)
+        if i < len(self._kickoffs) and self._kickoffs[i] == kickoff:
+            del self._kickoffs[i]
+        for ids in self._date_ids.values():
+            ids.discard(fid)
+
+    @staticmethod
+    def _discard(index: Dict[Any, Set[int]], key: Any, fid: int) -> None:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(fid)
+            if not ids:
+                del index[key]
+
+    def _drop_date(self, date_str: str) -> None:
+        self._payloads.pop(date_str, None)
+        for fid in self._date_ids.pop(date_str, set()):
+            if fid in self.fixtures:
+                self._remove(fid)
+
+
+fixture_index = FixtureIndex()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+from api_football import fetch, final_cache, inplay_cache
+from priority import Priority, priority
+
+INPLAY_STATS_INTERVAL = float(os.getenv("INPLAY_STATS_INTERVAL", "90"))
+# statistics refreshes per live poll; the stalest fixtures go first
+INPLAY_STATS_PER_CYCLE = int(os.getenv("INPLAY_STATS_PER_CYCLE", "20"))
+FINISHED_STATUSES = {"FT", "AET", "PEN", "PST", "CANC", "ABD", "AWD", "WO"}
+
+
+def _event_key(ev: Dict[str, Any]) -> Tuple:
+    t = ev.get("time") or {}
+    return (
+        t.get("elapsed"), t.get("extra"),
+        (ev.get("team") or {}).get("id"),
+        (ev.get("player") or {}).get("id"),
+        ev.get("type"), ev.get("detail"),
+    )
+
+
+class InPlayTracker:
+    """
+    Keeps events/statistics of fixtures in the live feed up to date:
+    events come with every fixtures?live=all poll and are appended to the
+    tracked list, statistics are refetched every INPLAY_STATS_INTERVAL.
+    When a fixture finishes (or drops out of the feed) its final record is
+    fetched once and frozen in `final_cache`.
+    """
+
+    def __init__(self, stats_interval: float = INPLAY_STATS_INTERVAL,
+                 stats_per_cycle: int = INPLAY_STATS_PER_CYCLE):
+        self.stats_interval = stats_interval
+        self.stats_per_cycle = stats_per_cycle
+        self._seen: Dict[int, set] = {}
+        self._stats_at: Dict[int, float] = {}
+
+    def merge_events(self, fixture_id: int, events: List[Dict[str, Any]]) -> None:
+        key = f"events_{fixture_id}"
+        record = inplay_cache.setdefault(key, {"response": []})
+        seen = self._seen.setdefault(fixture_id, set())
+        for ev in events:
+            ek = _event_key(ev)
+            if ek not in seen:
+                seen.add(ek)
+                record["response"].append(ev)
+
+    async def update(self, live: Dict[int, Dict[str, Any]]) -> None:
+        """Sync with the latest live fixtures snapshot (fixture id -> item)."""
+        finished = [fid for fid in self._seen if fid not in live]
+        now = time.monotonic()
+        due = []
+        for fid, item in live.items():
+            if item["fixture"]["status"].get("short") in FINISHED_STATUSES:
+                if f"events_{fid}" not in final_cache:
+                    finished.append(fid)
+                continue
+            self.merge_events(fid, item.get("events") or [])
+            if now - self._stats_at.get(fid, 0.0) >= self.stats_interval:
+                due.append(fid)
+
+        due.sort(key=lambda fid: self._stats_at.get(fid, 0.0))
+        due = due[:self.stats_per_cycle]
+
+        # one statistics call per live fixture every interval adds up over a
+        # day: background, so it yields to users and stops at the quota reserve
+        with priority(Priority.BACKGROUND):
+            await asyncio.gather(
+                *(self._refresh_statistics(fid, now) for fid in due),
+                *(self._finalize(fid) for fid in finished),
+            )
+
+    async def _refresh_statistics(self, fixture_id: int, now: float) -> None:
+        data = await fetch("fixtures/statistics", params={"fixture": fixture_id})
+        if not data.get("errors"):
+            inplay_cache[f"statistics_{fixture_id}"] = {"response": data.get("response", [])}
+            self._stats_at[fixture_id] = now
+
+    async def _finalize(self, fixture_id: int) -> None:
+        data = await fetch("fixtures", params={"id": fixture_id})
+        if data.get("errors"):
+            return  # retried on the next update
+        items = data.get("response", [])
+        self._seen.pop(fixture_id, None)
+        self._stats_at.pop(fixture_id, None)
+        events = inplay_cache.pop(f"events_{fixture_id}", None)
+        stats = inplay_cache.pop(f"statistics_{fixture_id}", None)
+        if not items or items[0]["fixture"]["status"].get("short") not in FINISHED_STATUSES:
+            # suspended/interrupted: fall back to the regular cached lookups
+            return
+        final = items[0]
+        # the final record is authoritative (it reflects e.g. goals cancelled by VAR)
+        final_cache[f"events_{fixture_id}"] = {
+            "response": final.get("events") or (events or {}).get("response", [])
+        }
+        final_cache[f"statistics_{fixture_id}"] = {
+            "response": final.get("statistics") or (stats or {}).get("response", [])
+        }
+
+
+inplay_tracker = InPlayTracker()
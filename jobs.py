@@ -0,0 +1,359 @@
+import asyncio
+import os
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+
+from api_football import fetch, get_leagues, resolve_season
+from priority import Priority, set_priority
+from tracing import detach_trace
+
+JOBS_DIR = os.getenv("JOBS_DIR", ".jobs")
+JOB_CONCURRENCY = int(os.getenv("JOB_CONCURRENCY", "8"))
+# how often a running job writes its progress for other workers to read
+JOB_STATUS_INTERVAL = float(os.getenv("JOB_STATUS_INTERVAL", "2"))
+
+
+# —――――――――――――――――――――――――――――――――
+# Job registry. With several uvicorn workers a job of a given kind runs in
+# exactly one of them (an O_EXCL lock file in JOBS_DIR) and its status is
+# written to JOBS_DIR, so any worker can report it.
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.pid = os.getpid()
+        self.status = "pending"
+        self.phase: Optional[str] = None
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self.status in ("pending", "running")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "pid": self.pid,
+            "status": self.status,
+            "phase": self.phase,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "progress": round(self.done / self.total, 4) if self.total else 0.0,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        job = cls(data["kind"])
+        for key in ("id", "pid", "status", "phase", "total", "done", "failed",
+                    "started_at", "finished_at", "error"):
+            setattr(job, key, data.get(key))
+        if job.running and not _pid_alive(job.pid):
+            # its worker died without writing a final status
+            job.status = "interrupted"
+        return job
+
+
+registry: Dict[str, Job] = {}
+
+
+def _status_name(job_id: str) -> str:
+    return f"job.{job_id}.json"
+
+
+def _lock_name(kind: str) -> str:
+    return f"{kind}.lock"
+
+
+def _save_status(job: Job) -> None:
+    _write_atomic(_status_name(job.id), job.to_dict())
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _acquire_lock(kind: str, job_id: str) -> Optional[str]:
+    """Take the cross-worker lock for `kind`; returns None, or the id of the job holding it."""
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    while True:
+        try:
+            fd = os.open(_path(_lock_name(kind)), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            holder = _read_json(_lock_name(kind))
+            if holder is None:
+                # created but not written yet: its owner is starting right now
+                return ""
+            if _pid_alive(holder.get("pid")):
+                return holder.get("job", "")
+            # left behind by a worker that died
+            _remove(_lock_name(kind))
+            continue
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"pid": os.getpid(), "job": job_id}))
+        return None
+
+
+def _release_lock(kind: str, job_id: str) -> None:
+    holder = _read_json(_lock_name(kind))
+    if holder is not None and holder.get("job") == job_id:
+        _remove(_lock_name(kind))
+
+
+def get_job(job_id: str) -> Optional[Job]:
+    job = registry.get(job_id)
+    if job is not None:
+        return job
+    data = _read_json(_status_name(job_id))
+    return Job.from_dict(data) if data else None
+
+
+def start_job(kind: str, run: Callable[[Job], Awaitable[None]]) -> Job:
+    """
+    Start `run(job)` in the background unless a job of `kind` is already
+    running here or in another worker; then that job is returned instead.
+    """
+    for job in registry.values():
+        if job.kind == kind and job.running:
+            return job
+    job = Job(kind)
+    holder = _acquire_lock(kind, job.id)
+    if holder is not None:
+        other = get_job(holder) if holder else None
+        if other is None:
+            # holder hasn't written its status yet
+            other = Job(kind)
+            other.id, other.pid = holder, None
+        return other
+    registry[job.id] = job
+    _save_status(job)
+
+    async def report():
+        while True:
+            await asyncio.sleep(JOB_STATUS_INTERVAL)
+            _save_status(job)
+
+    async def runner():
+        detach_trace()
+        job.status, job.started_at = "running", time.time()
+        reporter = asyncio.create_task(report())
+        try:
+            await run(job)
+            job.status = "done"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as exc:
+            job.status, job.error = "failed", repr(exc)
+        finally:
+            reporter.cancel()
+            job.finished_at = time.time()
+            _save_status(job)
+            _release_lock(kind, job.id)
+
+    job.task = asyncio.create_task(runner())
+    return job
+
+
+async def stop_jobs() -> None:
+    tasks = [job.task for job in registry.values() if job.task and not job.task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# —――――――――――――――――――――――――――――――――
+# Append-only checkpoint logs
+
+def _path(name: str) -> str:
+    return os.path.join(JOBS_DIR, name)
+
+
+def _read_lines(name: str) -> List[Any]:
+    try:
+        with open(_path(name), "rb") as f:
+            # a torn last line from a crash is simply redone
+            lines = []
+            for line in f:
+                try:
+                    lines.append(orjson.loads(line))
+                except orjson.JSONDecodeError:
+                    pass
+            return lines
+    except FileNotFoundError:
+        return []
+
+
+def _read_json(name: str) -> Optional[Any]:
+    try:
+        with open(_path(name), "rb") as f:
+            return orjson.loads(f.read())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        return None
+
+
+def _append_line(name: str, item: Any) -> None:
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    with open(_path(name), "ab") as f:
+        f.write(orjson.dumps(item) + b"\n")
+
+
+def _write_atomic(name: str, data: Any) -> None:
+    os.makedirs(JOBS_DIR, exist_ok=True)
+    tmp = _path(f"{name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(orjson.dumps(data))
+    os.replace(tmp, _path(name))
+
+
+def _remove(name: str) -> None:
+    try:
+        os.remove(_path(name))
+    except FileNotFoundError:
+        pass
+
+
+async def _bounded(items: List[Any], worker: Callable[[Any], Awaitable[None]],
+                   concurrency: int = JOB_CONCURRENCY) -> None:
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    async def consume():
+        while not queue.empty():
+            await worker(queue.get_nowait())
+
+    await asyncio.gather(*(consume() for _ in range(min(concurrency, len(items)) or 1)))
+
+
+# —――――――――――――――――――――――――――――――――
+# /teams/statistics/all crawler
+
+TEAM_STATS_KIND = "team_statistics"
+TEAM_STATS_STORE = "team_stats.json"
+TEAM_STATS_PLAN = "team_stats.plan.jsonl"
+TEAM_STATS_DONE = "team_stats.done.jsonl"
+
+team_stats_store: Optional[Dict[str, Any]] = None
+_team_stats_mtime: Optional[int] = None
+
+
+def load_team_stats_store() -> Optional[Dict[str, Any]]:
+    """(Re)load the store when the file changed, e.g. written by another worker."""
+    global team_stats_store, _team_stats_mtime
+    try:
+        mtime = os.stat(_path(TEAM_STATS_STORE)).st_mtime_ns
+    except FileNotFoundError:
+        return team_stats_store
+    if mtime != _team_stats_mtime:
+        store = _read_json(TEAM_STATS_STORE)
+        if store is not None:
+            team_stats_store, _team_stats_mtime = store, mtime
+    return team_stats_store
+
+
+def team_stats_checkpoint_exists() -> bool:
+    return os.path.exists(_path(TEAM_STATS_PLAN))
+
+
+async def crawl_team_statistics(job: Job) -> None:
+    """
+    Resumable crawl of teams/statistics for every team of every league's
+    current season. Planned leagues and finished stats are appended to
+    JSON-lines checkpoints, so a restarted crawl skips work already done.
+    """
+    global team_stats_store, _team_stats_mtime
+    # runs in cached-only mode once the daily budget is down to the bulk reserve;
+    # those items stay in the checkpoint for the next run
+    set_priority(Priority.BULK)
+
+    # 1. plan: league -> teams, one checkpoint line per league
+    job.phase = "planning"
+    leagues = (await get_leagues()).get("response", [])
+    planned = {p["league"]: p for p in _read_lines(TEAM_STATS_PLAN)}
+    todo_leagues = [
+        lg for lg in leagues
+        if lg["league"]["id"] not in planned and lg.get("seasons")
+    ]
+    job.total, job.done = len(leagues), len(leagues) - len(todo_leagues)
+
+    async def plan_league(lg: Dict[str, Any]) -> None:
+        lid = lg["league"]["id"]
+        season = await resolve_season(lid)
+        # uncached: the checkpoint keeps results, and tens of thousands of
+        # entries would evict the hot ones from general_cache
+        teams = await fetch("teams", params={"league": lid, "season": season})
+        if teams.get("errors"):
+            job.failed += 1
+            return
+        entry = {"league": lid, "season": season,
+                 "teams": [t["team"]["id"] for t in teams.get("response", [])]}
+        _append_line(TEAM_STATS_PLAN, entry)
+        planned[lid] = entry
+        job.done += 1
+
+    await _bounded(todo_leagues, plan_league)
+
+    # 2. crawl: one checkpoint line per finished team
+    job.phase = "crawling"
+    done: Dict[Tuple[int, int], Dict[str, Any]] = {
+        (d["team_id"], d["league_id"]): d for d in _read_lines(TEAM_STATS_DONE)
+    }
+    work = [
+        (tid, p["league"], p["season"])
+        for p in planned.values() for tid in p["teams"]
+    ]
+    todo = [w for w in work if (w[0], w[1]) not in done]
+    plan_failed = job.failed
+    job.total, job.done, job.failed = len(work), len(work) - len(todo), 0
+
+    async def crawl_team(item: Tuple[int, int, int]) -> None:
+        tid, lid, season = item
+        stats = await fetch("teams/statistics", params={"team": tid, "league": lid, "season": season})
+        if stats.get("errors"):
+            job.failed += 1
+            return
+        entry = {"team_id": tid, "league_id": lid, "stats": stats.get("response", {})}
+        _append_line(TEAM_STATS_DONE, entry)
+        done[(tid, lid)] = entry
+        job.done += 1
+
+    await _bounded(todo, crawl_team)
+
+    # 3. materialize; checkpoints are kept if anything failed so a rerun resumes
+    job.phase = "materializing"
+    team_stats_store = {
+        "updated_at": time.time(),
+        "response": [done[(tid, lid)] for tid, lid, _ in work if (tid, lid) in done],
+    }
+    _write_atomic(TEAM_STATS_STORE, team_stats_store)
+    _team_stats_mtime = os.stat(_path(TEAM_STATS_STORE)).st_mtime_ns
+    if not job.failed and not plan_failed:
+        _remove(TEAM_STATS_PLAN)
+        _remove(TEAM_STATS_DONE)
+
+
+def start_team_stats_crawl() -> Job:
+    return start_job(TEAM_STATS_KIND, crawl_team_statistics)
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import orjson
+
+from api_football import fetch
+from inplay import inplay_tracker
+from tracing import detach_trace
+
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", "10"))
+LIVE_IDLE_INTERVAL = float(os.getenv("LIVE_IDLE_INTERVAL", "120"))
+LIVE_BETS_INTERVAL = float(os.getenv("LIVE_BETS_INTERVAL", "600"))
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# topic -> (endpoint, params) polled once per cycle for all subscribers
+LIVE_TOPICS = {
+    "fixtures": ("fixtures", {"live": "all", "timezone": "Europe/Belgrade"}),
+    "odds":     ("odds/live", None),
+    "bets":     ("odds/live/bets", None),
+}
+# topics whose items are keyed by fixture id and diffed for subscribers
+DIFFED_TOPICS = ("fixtures", "odds")
+
+
+# —――――――――――――――――――――――――――――――――
+# Snapshot diffing
+
+def index_by_fixture(items: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+    return {item["fixture"]["id"]: item for item in items if item.get("fixture")}
+
+
+def _changed_fields(prev: Dict[str, Any], cur: Dict[str, Any], depth: int = 2) -> Dict[str, Any]:
+    # nested dicts are diffed `depth` levels deep, anything else is sent whole
+    changed: Dict[str, Any] = {}
+    for key, value in cur.items():
+        old = prev.get(key)
+        if old == value:
+            continue
+        if depth > 1 and isinstance(value, dict) and isinstance(old, dict):
+            changed[key] = _changed_fields(old, value, depth - 1)
+        else:
+            changed[key] = value
+    return changed
+
+
+def diff_snapshots(
+    old: Dict[int, Dict[str, Any]],
+    new: Dict[int, Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Return (changed, removed): new fixtures are sent whole under "data",
+    existing ones only with their changed fields under "changed".
+    """
+    changed: List[Dict[str, Any]] = []
+    for fid, item in new.items():
+        league_id = item.get("league", {}).get("id")
+        prev = old.get(fid)
+        if prev is None:
+            changed.append({"id": fid, "league": league_id, "data": item})
+            continue
+        fields = _changed_fields(prev, item)
+        if fields:
+            changed.append({"id": fid, "league": league_id, "changed": fields})
+    removed = [
+        {"id": fid, "league": item.get("league", {}).get("id")}
+        for fid, item in old.items() if fid not in new
+    ]
+    return changed, removed
+
+
+# —――――――――――――――――――――――――――――――――
+# Subscribers
+
+class Subscription:
+    def __init__(self, leagues: Optional[Set[int]] = None, fixtures: Optional[Set[int]] = None):
+        self.leagues  = leagues or set()
+        self.fixtures = fixtures or set()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+    def matches(self, fixture_id: int, league_id: Optional[int]) -> bool:
+        if self.fixtures and fixture_id not in self.fixtures:
+            return False
+        if self.leagues and league_id not in self.leagues:
+            return False
+        return True
+
+    def select(self, snapshot: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            item for fid, item in snapshot.items()
+            if self.matches(fid, item.get("league", {}).get("id"))
+        ]
+
+    def push(self, event: str, data: Dict[str, Any]) -> bool:
+        try:
+            self.queue.put_nowait((event, data))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+
+class LiveFeed:
+    """
+    Background live-data engine started with the app: polls the live
+    topics on its own cadence (LIVE_POLL_INTERVAL while matches are in
+    progress, LIVE_IDLE_INTERVAL when none are), swaps in each new payload
+    whole so /live, /odds/live and /odds/live/bets are served from memory,
+    pushes only changed fixtures/fields to SSE subscribers and drives the
+    in-play events/statistics tracker.
+    """
+
+    def __init__(self, interval: float = LIVE_POLL_INTERVAL,
+                 idle_interval: float = LIVE_IDLE_INTERVAL,
+                 bets_interval: float = LIVE_BETS_INTERVAL):
+        self.interval = interval
+        self.idle_interval = idle_interval
+        self.bets_interval = bets_interval
+        self.payloads: Dict[str, Dict[str, Any]] = {}
+        self.snapshots: Dict[str, Dict[int, Dict[str, Any]]] = {t: {} for t in DIFFED_TOPICS}
+        self._subscribers: Set[Subscription] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._bets_polled_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._ready = asyncio.Event()
+        self._task = asyncio.create_task(self._poll_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def payload(self, topic: str, timeout: float = 5.0) -> Optional[Dict[str, Any]]:
+        """
+        Latest payload for `topic`, waiting up to `timeout` for the first
+        poll after startup. None when the engine isn't running.
+        """
+        if not self.running or self._ready is None:
+            return None
+        if topic not in self.payloads:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.payloads.get(topic)
+
+    def subscribe(self, leagues: Optional[Set[int]] = None,
+                  fixtures: Optional[Set[int]] = None) -> Subscription:
+        sub = Subscription(leagues, fixtures)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+
+    def snapshot_for(self, sub: Subscription) -> Dict[str, List[Dict[str, Any]]]:
+        return {topic: sub.select(snap) for topic, snap in self.snapshots.items()}
+
+    async def poll_once(self) -> None:
+        now = time.monotonic()
+        topics = ["fixtures"]
+        # live odds only move while something is in play; keep polling until
+        # they're empty too so odds of finished matches get removed
+        if self.snapshots["fixtures"] or self.snapshots["odds"] or "odds" not in self.payloads:
+            topics.append("odds")
+        if now - self._bets_polled_at >= self.bets_interval:
+            topics.append("bets")
+
+        results = await asyncio.gather(*(
+            fetch(LIVE_TOPICS[t][0], params=LIVE_TOPICS[t][1]) for t in topics
+        ))
+        for topic, data in zip(topics, results):
+            if data.get("errors"):
+                # keep the last good snapshot rather than reporting everything as removed
+                continue
+            self.payloads[topic] = data
+            if topic == "bets":
+                self._bets_polled_at = now
+            if topic not in DIFFED_TOPICS:
+                continue
+            new = index_by_fixture(data.get("response", []))
+            changed, removed = diff_snapshots(self.snapshots[topic], new)
+            self.snapshots[topic] = new
+            if changed or removed:
+                self._publish(topic, changed, removed)
+
+    def _publish(self, topic: str, changed: List[Dict[str, Any]],
+                 removed: List[Dict[str, Any]]) -> None:
+        for sub in list(self._subscribers):
+            sub_changed = [c for c in changed if sub.matches(c["id"], c["league"])]
+            sub_removed = [r["id"] for r in removed if sub.matches(r["id"], r["league"])]
+            if not sub_changed and not sub_removed:
+                continue
+            if not sub.push(topic, {"changed": sub_changed, "removed": sub_removed}):
+                # slow consumer: drop its backlog and resync it with a full snapshot
+                while not sub.queue.empty():
+                    sub.queue.get_nowait()
+                sub.push("snapshot", self.snapshot_for(sub))
+
+    async def _poll_loop(self) -> None:
+        detach_trace()
+        while True:
+            try:
+                await self.poll_once()
+                await inplay_tracker.update(self.snapshots["fixtures"])
+            except Exception:
+                # a malformed payload must not stop the engine
+                pass
+            if self._ready is not None:
+                self._ready.set()
+            in_play = bool(self.snapshots["fixtures"])
+            await asyncio.sleep(self.interval if in_play else self.idle_interval)
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
+
+
+live_feed = LiveFeed()
@@ -1,9 +1,11 @@
 import asyncio
+from contextlib import asynccontextmanager
 from datetime import date, timedelta
+from typing import Optional
 
-from fastapi import FastAPI, Request
+from fastapi import Depends, FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import ORJSONResponse, PlainTextResponse
+from fastapi.responses import ORJSONResponse, PlainTextResponse, Response, StreamingResponse
 
 from api_football import (
     get_fixtures_by_date,
@@ -44,10 +46,47 @@ from api_football import (
     get_goals_over_under,
     get_cards_corners,
     get_historical_results,
-    get_btts_odds_by_date
+    get_btts_odds_by_date,
+    get_value_bets_by_date,
+    ensure_fixtures_indexed,
+    start_client,
+    close_client,
+    load_cache_snapshot,
+    save_cache_snapshot
 )
-
-app = FastAPI(default_response_class=ORJSONResponse)
+from fixture_index import fixture_index
+import jobs
+import metrics
+import tracing
+from priority import Priority, priority
+from quota import quota
+from scheduler import scheduler
+from standings import standings_snapshot
+from structs import TYPED_RESPONSES, FixturesEnvelope, OddsEnvelope, typed_response
+from live import live_feed, sse_event
+from query import FixtureQuery, parse_ids, parse_window
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    load_cache_snapshot()
+    await start_client()
+    await live_feed.start()
+    await standings_snapshot.start()
+    jobs.load_team_stats_store()
+    if jobs.team_stats_checkpoint_exists():
+        # resume a crawl interrupted by the last shutdown
+        jobs.start_team_stats_crawl()
+    yield
+    await jobs.stop_jobs()
+    await standings_snapshot.stop()
+    await live_feed.stop()
+    await close_client()
+    save_cache_snapshot()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
+app.router.route_class = tracing.TracedRoute
 
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +95,8 @@ app.add_middleware(
     allow_headers=["*"],
     allow_credentials=True,
 )
+app.add_middleware(metrics.MetricsMiddleware)
+app.add_middleware(tracing.TracingMiddleware)
 
 
 @app.exception_handler(Exception)
@@ -63,16 +104,58 @@ async def global_exception_handler(request: Request, exc: Exception):
     return ORJSONResponse({"error": "Internal server error"}, status_code=500)
 
 
+def fixture_query(
+    league: Optional[str] = None,
+    country: Optional[str] = None,
+    status: Optional[str] = None,
+    team: Optional[int] = None,
+    fields: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=500)
+) -> FixtureQuery:
+    """
+    Shared query params for per-fixture endpoints:
+    ?league=39,140&country=England&status=NS,1H&team=33
+    &fields=fixture.id,teams,odds&limit=50&cursor=...
+    """
+    try:
+        return FixtureQuery.from_params(league, country, status, team, fields, cursor, limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+
 @app.get("/")
 async def root():
     return {"message": "Today API is live"}
 
 
+@app.get("/metrics")
+async def prometheus_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE_LATEST)
+
+
+@app.get("/quota")
+async def upstream_quota():
+    return {**quota.status(), "scheduler": scheduler.status()}
+
+
+@app.get("/debug/traces/{trace_id}")
+async def debug_trace(trace_id: str):
+    """Breakdown of a request made with `X-Debug-Trace: 1` or `?trace=1`."""
+    trace = tracing.traces.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace.to_dict()
+
+
 # ─── Fixtures ─────────────────────────────────────────────────────────────────
 
 @app.get("/fixtures")
-async def fixtures(date: str):
-    return await get_fixtures_by_date(date)
+async def fixtures(date: str, query: FixtureQuery = Depends(fixture_query)):
+    result = await get_fixtures_by_date(date, query)
+    if TYPED_RESPONSES and not query.fields:
+        return typed_response(result, FixturesEnvelope)
+    return result
 
 
 @app.get("/fixtures/today")
@@ -97,89 +180,207 @@ async def full_today():
     today_str = date.today().isoformat()
     raw = await get_raw_fixtures(today_str)
     fixtures_list = raw.get("response", [])
-    tasks = [
-        asyncio.gather(
-            get_predictions_cached(fx["fixture"]["id"]),
-            get_odds_cached(fx["fixture"]["id"])
-        )
-        for fx in fixtures_list
-    ]
     results = []
-    if tasks:
-        preds_odds = await asyncio.gather(*tasks)
-        for fx, (pred, odds) in zip(fixtures_list, preds_odds):
-            fx["predictions"] = pred.get("response", [])
-            fx["odds"] = odds.get("response", [])
-            results.append(fx)
+    # two lookups per fixture of the day: bulk, like /fixtures/full-details
+    with priority(Priority.BULK):
+        tasks = [
+            asyncio.gather(
+                get_predictions_cached(fx["fixture"]["id"]),
+                get_odds_cached(fx["fixture"]["id"])
+            )
+            for fx in fixtures_list
+        ]
+        preds_odds = await asyncio.gather(*tasks) if tasks else []
+    for fx, (pred, odds) in zip(fixtures_list, preds_odds):
+        results.append({
+            **fx,
+            "predictions": pred.get("response", []),
+            "odds": odds.get("response", []),
+        })
     return {"response": results}
 
 
 @app.get("/fixtures/full-details")
-async def full_fixture_details(date: str):
+async def full_fixture_details(date: str, query: FixtureQuery = Depends(fixture_query)):
     raw = await get_raw_fixtures(date)
-    fixtures_list = raw.get("response", [])
+    # filter/page first so dropped fixtures cost no lookups
+    fixtures_list, next_cursor = query.select(raw.get("response", []))
     tasks = []
-    for fx in fixtures_list:
-        fid = fx["fixture"]["id"]
-        home_id = fx["teams"]["home"]["id"]
-        away_id = fx["teams"]["away"]["id"]
-        tasks.append(asyncio.gather(
-            get_predictions_cached(fid),
-            get_odds_cached(fid),
-            get_events(fid),
-            get_lineups(fid),
-            get_fixture_statistics(fid),
-            get_headtohead(home_id, away_id),
-        ))
+    # six lookups per fixture: a bulk fan-out, served cached-only when quota is
+    # low; scoped so the priority doesn't outlive the fan-out
+    with priority(Priority.BULK):
+        for fx in fixtures_list:
+            fid = fx["fixture"]["id"]
+            home_id = fx["teams"]["home"]["id"]
+            away_id = fx["teams"]["away"]["id"]
+            tasks.append(asyncio.gather(
+                get_predictions_cached(fid),
+                get_odds_cached(fid),
+                get_events(fid),
+                get_lineups(fid),
+                get_fixture_statistics(fid),
+                get_headtohead(home_id, away_id),
+            ))
+        all_data = await asyncio.gather(*tasks) if tasks else []
     results = []
-    if tasks:
-        all_data = await asyncio.gather(*tasks)
-        for fx, data in zip(fixtures_list, all_data):
-            pred, odds, events, lineups, stats, h2h = data
-            fx["predictions"] = pred.get("response", [])
-            fx["odds"] = odds.get("response", [])
-            fx["events"] = events.get("response", [])
-            fx["lineups"] = lineups.get("response", [])
-            fx["statistics"] = stats.get("response", [])
-            fx["h2h"] = h2h.get("response", [])
-            results.append(fx)
-    return {"response": results}
+    for fx, data in zip(fixtures_list, all_data):
+        pred, odds, events, lineups, stats, h2h = data
+        results.append({
+            **fx,
+            "predictions": pred.get("response", []),
+            "odds": odds.get("response", []),
+            "events": events.get("response", []),
+            "lineups": lineups.get("response", []),
+            "statistics": stats.get("response", []),
+            "h2h": h2h.get("response", []),
+        })
+    return query.envelope(results, next_cursor)
+
+
+async def _indexed_fixtures(
+    start: Optional[str],
+    end: Optional[str],
+    query: FixtureQuery,
+    default_days: int = 1,
+    league: Optional[int] = None,
+    team: Optional[int] = None
+):
+    try:
+        start_ts, end_ts, dates = parse_window(start, end, default_days)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    await ensure_fixtures_indexed(dates)
+    fixtures_list = fixture_index.lookup(
+        start_ts, end_ts,
+        leagues={league} if league is not None else query.leagues,
+        team=team if team is not None else query.team,
+        status=query.status,
+    )
+    page, next_cursor = query.select(fixtures_list)
+    return query.envelope(page, next_cursor)
+
+
+@app.get("/fixtures/by-league/{league_id}")
+async def fixtures_by_league(
+    league_id: int,
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to"),
+    query: FixtureQuery = Depends(fixture_query)
+):
+    """
+    GET /fixtures/by-league/{league_id}?from=YYYY-MM-DD&to=YYYY-MM-DD
+    League fixtures in the window (default: today), from the fixture index.
+    """
+    return await _indexed_fixtures(start, end, query, league=league_id)
 
 
-@app.get("/live")
-async def live():
-    return await get_live_fixtures()
+@app.get("/fixtures/by-team/{team_id}")
+async def fixtures_by_team(
+    team_id: int,
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to"),
+    query: FixtureQuery = Depends(fixture_query)
+):
+    """
+    GET /fixtures/by-team/{team_id}?from=&to=
+    Home and away fixtures of a team (default: the next 7 days).
+    """
+    return await _indexed_fixtures(start, end, query, default_days=7, team=team_id)
 
 
-# ─── Odds & Predictions ────────────────────────────────────────────────────────
+@app.get("/fixtures/window")
+async def fixtures_window(
+    start: Optional[str] = Query(None, alias="from"),
+    end: Optional[str] = Query(None, alias="to"),
+    query: FixtureQuery = Depends(fixture_query)
+):
+    """
+    GET /fixtures/window?from=2025-05-10T18:00&to=2025-05-10T22:00
+    Fixtures kicking off in a time window, sorted by kickoff.
+    """
+    return await _indexed_fixtures(start, end, query)
 
-@app.get("/odds/{fixture_id}")
-async def odds(fixture_id: int):
-    return await get_odds_cached(fixture_id)
 
+@app.get("/live")
+async def live():
+    # served from the live engine's in-memory snapshot when it is running
+    result = await live_feed.payload("fixtures") or await get_live_fixtures()
+    if TYPED_RESPONSES:
+        return typed_response(result, FixturesEnvelope)
+    return result
 
-@app.get("/predictions/{fixture_id}")
-async def predictions(fixture_id: int):
-    return await get_predictions_cached(fixture_id)
 
+@app.get("/live/stream")
+async def live_stream(league: Optional[str] = None, fixture: Optional[str] = None):
+    """
+    GET /live/stream?league=39,140&fixture=
+    Server-Sent Events: a "snapshot" event with the current live fixtures
+    and odds, then "fixtures"/"odds" events carrying only changed fields.
+    """
+    try:
+        leagues, fixtures = parse_ids(league), parse_ids(fixture)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    sub = live_feed.subscribe(leagues, fixtures)
+
+    async def events():
+        try:
+            yield sse_event("snapshot", live_feed.snapshot_for(sub))
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(sub.queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield sse_event(event, data)
+        finally:
+            live_feed.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ─── Odds & Predictions ────────────────────────────────────────────────────────
 
+# /odds/live must be registered before /odds/{fixture_id} or it never matches
 @app.get("/odds/live")
 async def odds_live():
-    return await get_live_odds()
+    return await live_feed.payload("odds") or await get_live_odds()
 
 
 @app.get("/odds/live/bets")
 async def odds_live_bets():
-    return await get_live_odds_bets()
+    return await live_feed.payload("bets") or await get_live_odds_bets()
+
+
+@app.get("/odds/{fixture_id}")
+async def odds(fixture_id: int):
+    result = await get_odds_cached(fixture_id)
+    if TYPED_RESPONSES:
+        return typed_response(result, OddsEnvelope)
+    return result
+
+
+@app.get("/predictions/{fixture_id}")
+async def predictions(fixture_id: int):
+    return await get_predictions_cached(fixture_id)
 
 
 @app.get("/odds")
 async def odds_all(
     fixture: int = None,
-    league: int = None,
     season: int = None,
-    date: str = None
+    date: str = None,
+    query: FixtureQuery = Depends(fixture_query)
 ):
+    # by date: per-fixture odds of that day, filtered (incl. ?league=) and paged
+    if date is not None and fixture is None and season is None:
+        with priority(Priority.BULK):
+            return await get_odds_by_date(date, query)
+    league = next(iter(query.leagues)) if len(query.leagues) == 1 else None
     return await fetch_odds_general(fixture, league, season, date)
 
 
@@ -195,9 +396,23 @@ async def leagues_seasons():
     return await get_leagues_seasons()
 
 
+# /standings/all must be registered before /standings/{league_id}
+@app.get("/standings/all")
+async def all_standings():
+    """
+    Standings of every league with fixtures around today, served from the
+    background-refreshed snapshot.
+    """
+    await standings_snapshot.ensure_ready()
+    return standings_snapshot.all()
+
+
 @app.get("/standings/{league_id}")
-async def standings(league_id: int):
-    return await get_standings(league_id)
+async def standings(league_id: int, season: Optional[int] = None):
+    table = standings_snapshot.get(league_id)
+    if table is not None and season in (None, table["season"]):
+        return {"response": table["standings"]}
+    return await get_standings(league_id, season)
 
 
 # ─── Teams ─────────────────────────────────────────────────────────────────────
@@ -208,8 +423,8 @@ async def teams(country: str = None, league_id: int = None, season: int = None):
 
 
 @app.get("/teams/statistics/{team_id}/{league_id}")
-async def team_statistics(team_id: int, league_id: int):
-    return await get_team_statistics(team_id, league_id)
+async def team_statistics(team_id: int, league_id: int, season: Optional[int] = None):
+    return await get_team_statistics(team_id, league_id, season)
 
 
 @app.get("/teams/countries")
@@ -225,28 +440,28 @@ async def players(team_id: int, season: int):
 
 
 @app.get("/players/statistics/{player_id}/{league_id}")
-async def player_statistics(player_id: int, league_id: int):
-    return await get_player_statistics(player_id, league_id)
+async def player_statistics(player_id: int, league_id: int, season: Optional[int] = None):
+    return await get_player_statistics(player_id, league_id, season)
 
 
 @app.get("/players/topscorers/{league_id}")
-async def players_topscorers(league_id: int):
-    return await get_topscorers(league_id)
+async def players_topscorers(league_id: int, season: Optional[int] = None):
+    return await get_topscorers(league_id, season)
 
 
 @app.get("/players/topassists/{league_id}")
-async def players_topassists(league_id: int):
-    return await get_topassists(league_id)
+async def players_topassists(league_id: int, season: Optional[int] = None):
+    return await get_topassists(league_id, season)
 
 
 @app.get("/players/topyellowcards/{league_id}")
-async def players_topyellowcards(league_id: int):
-    return await get_topyellowcards(league_id)
+async def players_topyellowcards(league_id: int, season: Optional[int] = None):
+    return await get_topyellowcards(league_id, season)
 
 
 @app.get("/players/topredcards/{league_id}")
-async def players_topredcards(league_id: int):
-    return await get_topredcards(league_id)
+async def players_topredcards(league_id: int, season: Optional[int] = None):
+    return await get_topredcards(league_id, season)
 
 
 @app.get("/players/squads/{team_id}/{season}")
@@ -291,60 +506,42 @@ async def test_raw(date: str):
 
 
 @app.get("/teams/statistics/all")
-async def all_team_stats():
-    leagues_data = await get_leagues()
-    leagues = leagues_data.get("response", [])
-    teams_tasks = [
-        get_teams(league_id=lg["league"]["id"], season=lg["seasons"][-1]["year"])
-        for lg in leagues
-    ]
-    teams_results = await asyncio.gather(*teams_tasks)
-
-    stats_tasks = []
-    for lg, team_list in zip(leagues, teams_results):
-        lid = lg["league"]["id"]
-        for t in team_list.get("response", []):
-            stats_tasks.append(get_team_statistics(t["team"]["id"], lid))
-    stats_results = await asyncio.gather(*stats_tasks)
-
-    response = []
-    idx = 0
-    for lg, team_list in zip(leagues, teams_results):
-        lid = lg["league"]["id"]
-        for t in team_list.get("response", []):
-            response.append({
-                "team_id": t["team"]["id"],
-                "league_id": lid,
-                "stats": stats_results[idx].get("response", {})
-            })
-            idx += 1
-    return {"response": response}
-
-
-@app.get("/standings/all")
-async def all_standings():
-    leagues_data = await get_leagues()
-    leagues = leagues_data.get("response", [])
-    standings_tasks = [get_standings(lg["league"]["id"]) for lg in leagues]
-    standings_results = await asyncio.gather(*standings_tasks)
+async def all_team_stats(refresh: bool = False):
+    """
+    Served from the materialized store built by the background crawler.
+    Until the first crawl finishes this returns 202 with the job; poll
+    /jobs/{id} for progress. ?refresh=true recrawls while the old store
+    keeps being served.
+    """
+    job = None
+    # another worker may have finished a crawl since this one loaded the store
+    jobs.load_team_stats_store()
+    if jobs.team_stats_store is None or refresh:
+        job = jobs.start_team_stats_crawl()
+    if jobs.team_stats_store is None:
+        return ORJSONResponse({"job": job.to_dict()}, status_code=202)
+    if job is not None:
+        return {**jobs.team_stats_store, "job": job.to_dict()}
+    return jobs.team_stats_store
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(job_id: str):
+    job = jobs.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
 
-    response = [
-        {"league_id": lg["league"]["id"], "standings": res.get("response", [])}
-        for lg, res in zip(leagues, standings_results)
-    ]
-    return {"response": response}
 
 @app.get("/predictions")
-async def predictions(date: str):
-    return await get_predictions_by_date(date)
-
-@app.get("/odds")
-async def odds(date: str):
-    return await get_odds_by_date(date)
+async def predictions(date: str, query: FixtureQuery = Depends(fixture_query)):
+    with priority(Priority.BULK):
+        return await get_predictions_by_date(date, query)
 
 @app.get("/comparison")
 async def comparison(date: str):
-    return await get_comparison_by_date(date)
+    with priority(Priority.BULK):
+        return await get_comparison_by_date(date)
 
 # ─── Novi endpointi za dodatne analitike ──────────────────────────────────────
 
@@ -376,4 +573,18 @@ async def odds_btts(date: str):
     GET /odds/btts/{date}
     Returns for each fixture on that date its BTTS Yes/No odds.
     """
-    return await get_btts_odds_by_date(date)
+    with priority(Priority.BULK):
+        return await get_btts_odds_by_date(date)
+
+
+# ─── Value Bets Endpoint ───────────────────────────────────────────────────────
+
+@app.get("/value-bets")
+async def value_bets(date: str, threshold: float = 1.05):
+    """
+    GET /value-bets?date=YYYY-MM-DD&threshold=1.05
+    Returns home/draw/away outcomes whose predicted probability × best
+    Match Winner odd exceeds `threshold`, sorted by value descending.
+    """
+    with priority(Priority.BULK):
+        return await get_value_bets_by_date(date, threshold)
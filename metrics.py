@@ -0,0 +1,159 @@
+import time
+from typing import Any, Iterable, List, Optional, Tuple
+
+from cachetools import Cache, TTLCache
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# —――――――――――――――――――――――――――――――――
+# Upstream (API-Football)
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_seconds", "API-Football request latency", ["endpoint"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0),
+)
+UPSTREAM_RESPONSE_BYTES = Histogram(
+    "upstream_response_bytes", "API-Football response body size", ["endpoint"],
+    buckets=(1e3, 1e4, 1e5, 1e6, 1e7),
+)
+UPSTREAM_ERRORS = Counter("upstream_errors_total", "Failed API-Football requests", ["endpoint"])
+UPSTREAM_IN_FLIGHT = Gauge("upstream_in_flight", "API-Football requests in flight")
+QUOTA_REMAINING = Gauge("upstream_quota_remaining", "Remaining API-Football requests", ["window"])
+QUOTA_LIMIT = Gauge("upstream_quota_limit", "API-Football request limit", ["window"])
+UPSTREAM_DEGRADED = Counter(
+    "upstream_degraded_total", "Cache misses refused to save quota", ["priority"]
+)
+UPSTREAM_QUEUED = Gauge("upstream_queued", "Upstream calls waiting for a slot", ["priority"])
+UPSTREAM_QUEUE_WAIT = Histogram(
+    "upstream_queue_seconds", "Time spent waiting for an upstream slot", ["priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+# window -> (remaining header, limit header)
+QUOTA_HEADERS = {
+    "day":    ("x-ratelimit-requests-remaining", "x-ratelimit-requests-limit"),
+    "minute": ("x-ratelimit-remaining", "x-ratelimit-limit"),
+}
+
+
+def observe_upstream(endpoint: str, started: float, resp: Optional[Any]) -> None:
+    UPSTREAM_LATENCY.labels(endpoint).observe(time.perf_counter() - started)
+    if resp is None:
+        UPSTREAM_ERRORS.labels(endpoint).inc()
+        return
+    UPSTREAM_RESPONSE_BYTES.labels(endpoint).observe(len(resp.content))
+    for window, (remaining, limit) in QUOTA_HEADERS.items():
+        if remaining in resp.headers:
+            QUOTA_REMAINING.labels(window).set(float(resp.headers[remaining]))
+        if limit in resp.headers:
+            QUOTA_LIMIT.labels(window).set(float(resp.headers[limit]))
+
+
+# —――――――――――――――――――――――――――――――――
+# Caches
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups", ["cache", "result"])
+CACHE_EVICTIONS = Counter("cache_evictions_total", "Cache evictions", ["cache", "reason"])
+CACHE_ENTRIES = Gauge("cache_entries", "Entries currently cached", ["cache"])
+
+
+class MeteredTTLCache(TTLCache):
+    """TTLCache that counts hits, misses and size/TTL evictions under `name`."""
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.name = name
+        # label children bound once, so the hit path is a single inc()
+        self.hits = CACHE_REQUESTS.labels(name, "hit")
+        self.misses = CACHE_REQUESTS.labels(name, "miss")
+        self._evicted_size = CACHE_EVICTIONS.labels(name, "size")
+        self._evicted_ttl = CACHE_EVICTIONS.labels(name, "expired")
+        CACHE_ENTRIES.labels(name).set_function(lambda: len(self))
+
+    def expire(self, time=None):
+        # TTLCache.currsize itself expires, so count via the base Cache
+        before = Cache.currsize.fget(self)
+        result = super().expire(time)
+        evicted = before - Cache.currsize.fget(self)
+        if evicted:
+            self._evicted_ttl.inc(evicted)
+        return result
+
+    def popitem(self):
+        item = super().popitem()
+        self._evicted_size.inc()
+        return item
+
+    # warm-start snapshots; the per-key expiry lives on cachetools' private
+    # links, which is why requirements.txt pins cachetools
+
+    def dump(self) -> List[Tuple[Any, float, Any]]:
+        """(key, seconds left, value) for every live entry."""
+        now = self.timer()
+        self.expire(now)
+        links = self._TTLCache__links
+        return [(key, links[key].expires - now, value) for key, value in self.items()]
+
+    def restore(self, entries: Iterable[Tuple[Any, float, Any]]) -> int:
+        """Insert dumped entries, keeping their remaining TTL; returns how many."""
+        links = self._TTLCache__links
+        count = 0
+        # shortest-lived first keeps the expiry list ordered
+        for key, left, value in sorted(entries, key=lambda e: e[1]):
+            if left <= 0 or key in self:
+                continue
+            self[key] = value
+            links[key].expires = self.timer() + min(left, self.ttl)
+            count += 1
+        return count
+
+
+# —――――――――――――――――――――――――――――――――
+# Routes
+
+ROUTE_LATENCY = Histogram(
+    "http_request_seconds", "Route latency", ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+ROUTE_RESPONSE_BYTES = Histogram(
+    "http_response_bytes", "Route response body size", ["route"],
+    buckets=(1e2, 1e3, 1e4, 1e5, 1e6, 1e7),
+)
+
+
+class MetricsMiddleware:
+    """
+    Plain ASGI middleware (no BaseHTTPMiddleware overhead); routes are
+    labelled by their path template, unmatched paths as "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_wrapper(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            ROUTE_LATENCY.labels(scope["method"], path, str(status)).observe(time.perf_counter() - started)
+            ROUTE_RESPONSE_BYTES.labels(path).observe(size)
+
+
+def render() -> bytes:
+    return generate_latest()
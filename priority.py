@@ -0,0 +1,33 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Iterator
+
+
+class Priority(IntEnum):
+    """Upstream call classes, most important first."""
+    INTERACTIVE = 0   # user requests, live data
+    BACKGROUND  = 1   # periodic refreshes (standings snapshot)
+    BULK        = 2   # crawlers and large fan-outs
+
+
+# set per task; asyncio copies it into tasks spawned by gather()/create_task()
+_current: ContextVar[Priority] = ContextVar("upstream_priority", default=Priority.INTERACTIVE)
+
+
+def current_priority() -> Priority:
+    return _current.get()
+
+
+def set_priority(level: Priority) -> None:
+    """Set the priority for the rest of the current task."""
+    _current.set(level)
+
+
+@contextmanager
+def priority(level: Priority) -> Iterator[None]:
+    token = _current.set(level)
+    try:
+        yield
+    finally:
+        _current.reset(token)
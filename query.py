@@ -0,0 +1,178 @@
+import base64
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+TIMEZONE = ZoneInfo("Europe/Belgrade")
+
+
+def parse_ids(value: Optional[str]) -> Set[int]:
+    # "39,140" -> {39, 140}
+    return {int(v) for v in value.split(",") if v.strip()} if value else set()
+
+
+def _parse_moment(value: str, end_of_day: bool = False) -> datetime:
+    # "YYYY-MM-DD" covers the whole day, naive datetimes are Europe/Belgrade
+    if len(value) == 10:
+        d = date.fromisoformat(value)
+        return datetime.combine(d, time.max if end_of_day else time.min, TIMEZONE)
+    moment = datetime.fromisoformat(value)
+    return moment if moment.tzinfo else moment.replace(tzinfo=TIMEZONE)
+
+
+def parse_window(
+    start: Optional[str],
+    end: Optional[str],
+    default_days: int = 1,
+    max_days: int = 14
+) -> Tuple[int, int, List[str]]:
+    """
+    Resolve a from/to query window into (start_ts, end_ts, dates), where
+    `dates` are the fixtures?date= days it spans. Defaults to `default_days`
+    days starting today.
+    """
+    try:
+        start_dt = _parse_moment(start) if start else datetime.combine(date.today(), time.min, TIMEZONE)
+        if end:
+            end_dt = _parse_moment(end, end_of_day=True)
+        else:
+            last_day = start_dt.astimezone(TIMEZONE).date() + timedelta(days=default_days - 1)
+            end_dt = datetime.combine(last_day, time.max, TIMEZONE)
+    except ValueError:
+        raise ValueError(f"invalid window: from={start!r} to={end!r}")
+
+    first, last = start_dt.astimezone(TIMEZONE).date(), end_dt.astimezone(TIMEZONE).date()
+    if last < first or (last - first).days >= max_days:
+        raise ValueError(f"window must span 1 to {max_days} days")
+    dates = [(first + timedelta(days=i)).isoformat() for i in range((last - first).days + 1)]
+    return int(start_dt.timestamp()), int(end_dt.timestamp()), dates
+
+
+def _sort_key(fx: Dict[str, Any]) -> Tuple[int, int]:
+    return (fx["fixture"].get("timestamp") or 0, fx["fixture"]["id"])
+
+
+def encode_cursor(key: Tuple[int, int]) -> str:
+    return base64.urlsafe_b64encode(f"{key[0]}:{key[1]}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        ts, fid = base64.urlsafe_b64decode(cursor.encode()).decode().split(":")
+        return int(ts), int(fid)
+    except Exception:
+        raise ValueError(f"invalid cursor: {cursor!r}")
+
+
+def _field_tree(fields: List[str]) -> Dict[str, Any]:
+    # ["fixture.id", "teams"] -> {"fixture": {"id": {}}, "teams": {}}
+    tree: Dict[str, Any] = {}
+    for path in fields:
+        node = tree
+        for part in path.split("."):
+            node = node.setdefault(part, {})
+    return tree
+
+
+def _project(value: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return value
+    if isinstance(value, list):
+        return [_project(v, tree) for v in value]
+    if not isinstance(value, dict):
+        return value
+    return {k: _project(value[k], sub) for k, sub in tree.items() if k in value}
+
+
+class FixtureQuery:
+    """
+    Filtering, field projection and cursor pagination for per-fixture
+    responses. `select` runs on the raw fixtures list before enrichment so
+    filtered-out fixtures never trigger predictions/odds/events lookups;
+    `envelope` projects the enriched page and adds the next cursor.
+    """
+
+    def __init__(
+        self,
+        leagues: Optional[Set[int]] = None,
+        country: Optional[str] = None,
+        status: Optional[Set[str]] = None,
+        team: Optional[int] = None,
+        fields: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None
+    ):
+        self.leagues = leagues or set()
+        self.country = country.lower() if country else None
+        self.status  = status or set()
+        self.team    = team
+        self.fields  = _field_tree(fields) if fields else {}
+        self.after   = decode_cursor(cursor) if cursor else None
+        self.limit   = limit
+
+    @classmethod
+    def from_params(cls, league: Optional[str] = None, country: Optional[str] = None,
+                    status: Optional[str] = None, team: Optional[int] = None,
+                    fields: Optional[str] = None, cursor: Optional[str] = None,
+                    limit: Optional[int] = None) -> "FixtureQuery":
+        return cls(
+            leagues=parse_ids(league),
+            country=country,
+            status={s.strip().upper() for s in status.split(",") if s.strip()} if status else None,
+            team=team,
+            fields=[f.strip() for f in fields.split(",") if f.strip()] if fields else None,
+            cursor=cursor,
+            limit=limit,
+        )
+
+    @property
+    def filtered(self) -> bool:
+        return bool(self.leagues or self.country or self.status or self.team)
+
+    @property
+    def paginated(self) -> bool:
+        return self.limit is not None or self.after is not None
+
+    @property
+    def active(self) -> bool:
+        return self.filtered or self.paginated or bool(self.fields)
+
+    def matches(self, fx: Dict[str, Any]) -> bool:
+        league = fx.get("league", {})
+        if self.leagues and league.get("id") not in self.leagues:
+            return False
+        if self.country and (league.get("country") or "").lower() != self.country:
+            return False
+        if self.status and fx["fixture"].get("status", {}).get("short") not in self.status:
+            return False
+        if self.team is not None:
+            teams = fx.get("teams", {})
+            if self.team not in (teams.get("home", {}).get("id"), teams.get("away", {}).get("id")):
+                return False
+        return True
+
+    def select(self, fixtures: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Filter and page raw fixtures; returns (page, next cursor)."""
+        if self.filtered:
+            fixtures = [fx for fx in fixtures if self.matches(fx)]
+        if not self.paginated:
+            return fixtures, None
+
+        # pages are stable on (kickoff timestamp, fixture id)
+        fixtures = sorted(fixtures, key=_sort_key)
+        start = 0
+        if self.after is not None:
+            start = bisect_right([_sort_key(fx) for fx in fixtures], self.after)
+        end = len(fixtures) if self.limit is None else start + self.limit
+        page = fixtures[start:end]
+        next_cursor = encode_cursor(_sort_key(page[-1])) if page and end < len(fixtures) else None
+        return page, next_cursor
+
+    def envelope(self, items: List[Dict[str, Any]], next_cursor: Optional[str] = None) -> Dict[str, Any]:
+        if self.fields:
+            items = [_project(item, self.fields) for item in items]
+        result: Dict[str, Any] = {"response": items}
+        if self.paginated:
+            result["paging"] = {"next": next_cursor}
+        return result
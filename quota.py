@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from metrics import QUOTA_HEADERS
+from priority import Priority
+
+# share of the daily limit that lower priorities may not spend
+QUOTA_BACKGROUND_RESERVE = float(os.getenv("QUOTA_BACKGROUND_RESERVE", "0.05"))
+QUOTA_BULK_RESERVE = float(os.getenv("QUOTA_BULK_RESERVE", "0.20"))
+# requests per minute kept for interactive traffic
+QUOTA_MINUTE_RESERVE = int(os.getenv("QUOTA_MINUTE_RESERVE", "10"))
+
+
+class QuotaManager:
+    """
+    Tracks the remaining API-Football budget from response headers and
+    decides whether a call of a given priority may go upstream. Each call
+    is counted when it starts, so concurrent bursts are accounted for
+    before their headers arrive; the next response corrects the count.
+    Interactive calls are never refused.
+    """
+
+    def __init__(self):
+        self.daily_remaining: Optional[float] = None
+        self.daily_limit: Optional[float] = None
+        self.minute_remaining: Optional[float] = None
+        self.minute_limit: Optional[float] = None
+        self._minute_seen_at = 0.0
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        daily, minute = QUOTA_HEADERS["day"], QUOTA_HEADERS["minute"]
+        if daily[0] in headers:
+            self.daily_remaining = float(headers[daily[0]])
+        if daily[1] in headers:
+            self.daily_limit = float(headers[daily[1]])
+        if minute[0] in headers:
+            self.minute_remaining = float(headers[minute[0]])
+            self._minute_seen_at = time.monotonic()
+        if minute[1] in headers:
+            self.minute_limit = float(headers[minute[1]])
+
+    def _daily_reserve(self, level: Priority) -> float:
+        if self.daily_limit is None:
+            return 0.0
+        share = QUOTA_BULK_RESERVE if level == Priority.BULK else QUOTA_BACKGROUND_RESERVE
+        return self.daily_limit * share
+
+    def allows(self, level: Priority) -> bool:
+        if level == Priority.INTERACTIVE:
+            return True
+        if self.daily_remaining is not None and self.daily_remaining <= self._daily_reserve(level):
+            return False
+        # the per-minute window resets, so a count older than a minute is stale
+        fresh = time.monotonic() - self._minute_seen_at < 60
+        if fresh and self.minute_remaining is not None:
+            reserve = QUOTA_MINUTE_RESERVE * (2 if level == Priority.BULK else 1)
+            if self.minute_remaining <= reserve:
+                return False
+        return True
+
+    def consume(self) -> None:
+        if self.daily_remaining is not None:
+            self.daily_remaining -= 1
+        if self.minute_remaining is not None:
+            self.minute_remaining -= 1
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "daily": {"remaining": self.daily_remaining, "limit": self.daily_limit},
+            "minute": {"remaining": self.minute_remaining, "limit": self.minute_limit},
+            "allows": {p.name.lower(): self.allows(p) for p in Priority},
+        }
+
+
+quota = QuotaManager()
@@ -0,0 +1,103 @@
+import asyncio
+import heapq
+import itertools
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+from metrics import UPSTREAM_QUEUED, UPSTREAM_QUEUE_WAIT
+from priority import Priority, current_priority
+
+# upstream calls in flight at once; kept below the client's connection pool
+# so requests never queue (and time out) inside httpx
+UPSTREAM_CONCURRENCY = int(os.getenv("UPSTREAM_CONCURRENCY", "50"))
+# share of the slots a class may fill; the rest stays free for higher classes
+UPSTREAM_BACKGROUND_SHARE = float(os.getenv("UPSTREAM_BACKGROUND_SHARE", "0.5"))
+UPSTREAM_BULK_SHARE = float(os.getenv("UPSTREAM_BULK_SHARE", "0.25"))
+
+
+class PriorityScheduler:
+    """
+    Admission control in front of the upstream client. Waiting calls are
+    served strictly by priority (FIFO within a class), and background/bulk
+    calls are only admitted while fewer than their share of the slots are
+    busy, so an interactive call only waits when every slot is taken, and
+    then goes ahead of any queued bulk work.
+    """
+
+    def __init__(self, slots: int = UPSTREAM_CONCURRENCY):
+        self.slots = slots
+        self.limits = {
+            Priority.INTERACTIVE: slots,
+            Priority.BACKGROUND:  max(1, int(slots * UPSTREAM_BACKGROUND_SHARE)),
+            Priority.BULK:        max(1, int(slots * UPSTREAM_BULK_SHARE)),
+        }
+        self.in_use = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    def _admits(self, level: Priority) -> bool:
+        return self.in_use < self.limits[level]
+
+    def _wake(self) -> None:
+        while self._waiters:
+            level, _, fut = self._waiters[0]
+            if fut.done():
+                # cancelled while waiting
+                heapq.heappop(self._waiters)
+                continue
+            # the head has the highest priority and the largest limit:
+            # if it can't run, nothing behind it can either
+            if not self._admits(Priority(level)):
+                return
+            heapq.heappop(self._waiters)
+            self.in_use += 1
+            fut.set_result(None)
+
+    async def acquire(self, level: Priority) -> None:
+        if not self._waiters and self._admits(level):
+            self.in_use += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (int(level), next(self._seq), fut))
+        UPSTREAM_QUEUED.labels(level.name.lower()).inc()
+        # a higher-priority call queued behind blocked lower ones lands at
+        # the head of the heap and may be admissible right away
+        self._wake()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # granted and cancelled in the same tick: hand the slot on
+                self.release()
+            raise
+        finally:
+            UPSTREAM_QUEUED.labels(level.name.lower()).dec()
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._wake()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[float]:
+        """Hold an upstream slot for the current task's priority; yields the wait."""
+        level = current_priority()
+        started = time.perf_counter()
+        await self.acquire(level)
+        waited = time.perf_counter() - started
+        UPSTREAM_QUEUE_WAIT.labels(level.name.lower()).observe(waited)
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def status(self) -> Dict[str, int]:
+        return {
+            "slots": self.slots,
+            "in_use": self.in_use,
+            "waiting": sum(1 for _, _, fut in self._waiters if not fut.done()),
+        }
+
+
+scheduler = PriorityScheduler()
@@ -0,0 +1,139 @@
+import asyncio
+import hashlib
+import os
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+import orjson
+
+from api_football import ensure_fixtures_indexed, fetch
+from fixture_index import fixture_index
+from priority import Priority, set_priority
+from query import parse_window
+from tracing import detach_trace
+
+STANDINGS_REFRESH_INTERVAL = float(os.getenv("STANDINGS_REFRESH_INTERVAL", "900"))
+STANDINGS_WINDOW_DAYS = int(os.getenv("STANDINGS_WINDOW_DAYS", "1"))
+STANDINGS_CONCURRENCY = int(os.getenv("STANDINGS_CONCURRENCY", "8"))
+
+
+def content_hash(data: Any) -> str:
+    return hashlib.sha1(orjson.dumps(data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+class StandingsSnapshot:
+    """
+    Materialized standings, refreshed in the background only for leagues
+    with fixtures within STANDINGS_WINDOW_DAYS of today (taken from the
+    fixture index, with the season each fixture carries). Tables are
+    content-hashed so an unchanged table keeps its entry and timestamp.
+    """
+
+    def __init__(self, interval: float = STANDINGS_REFRESH_INTERVAL,
+                 window_days: int = STANDINGS_WINDOW_DAYS):
+        self.interval = interval
+        self.window_days = window_days
+        self.tables: Dict[int, Dict[str, Any]] = {}
+        self.refreshed_at: Optional[float] = None
+        self.last_refresh: Dict[str, int] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+
+    async def active_leagues(self) -> Dict[int, int]:
+        """league id -> season for leagues with fixtures in the window."""
+        today = date.today()
+        start = (today - timedelta(days=self.window_days)).isoformat()
+        end = (today + timedelta(days=self.window_days)).isoformat()
+        start_ts, end_ts, dates = parse_window(start, end, max_days=2 * self.window_days + 1)
+        await ensure_fixtures_indexed(dates)
+        return {
+            fx["league"]["id"]: fx["league"]["season"]
+            for fx in fixture_index.lookup(start_ts, end_ts)
+            if fx.get("league", {}).get("season")
+        }
+
+    async def refresh(self) -> Dict[str, int]:
+        leagues = await self.active_leagues()
+        sem = asyncio.Semaphore(STANDINGS_CONCURRENCY)
+        counts = {"leagues": len(leagues), "updated": 0, "unchanged": 0, "failed": 0, "removed": 0}
+
+        async def refresh_league(league_id: int, season: int) -> None:
+            async with sem:
+                data = await fetch("standings", params={"league": league_id, "season": season})
+            if data.get("errors"):
+                counts["failed"] += 1
+                return
+            standings = data.get("response", [])
+            digest = content_hash(standings)
+            current = self.tables.get(league_id)
+            if current is not None and current["hash"] == digest:
+                counts["unchanged"] += 1
+                return
+            self.tables[league_id] = {
+                "hash": digest,
+                "season": season,
+                "updated_at": time.time(),
+                "standings": standings,
+            }
+            counts["updated"] += 1
+
+        await asyncio.gather(*(refresh_league(lid, s) for lid, s in leagues.items()))
+        # leagues that left the window; /standings/{id} still fetches them on demand
+        for league_id in [lid for lid in self.tables if lid not in leagues]:
+            del self.tables[league_id]
+            counts["removed"] += 1
+        self.refreshed_at = time.time()
+        self.last_refresh = counts
+        self._ready.set()
+        return counts
+
+    async def ensure_ready(self, timeout: float = 10.0) -> None:
+        if self.refreshed_at is not None:
+            return
+        if self._task is None:
+            await self.refresh()
+            return
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def get(self, league_id: int) -> Optional[Dict[str, Any]]:
+        return self.tables.get(league_id)
+
+    def all(self) -> Dict[str, Any]:
+        return {
+            "refreshed_at": self.refreshed_at,
+            "response": [
+                {"league_id": lid, "standings": t["standings"]}
+                for lid, t in self.tables.items()
+            ],
+        }
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _refresh_loop(self) -> None:
+        detach_trace()
+        set_priority(Priority.BACKGROUND)
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                pass
+            await asyncio.sleep(self.interval)
+
+
+standings_snapshot = StandingsSnapshot()
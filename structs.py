@@ -0,0 +1,190 @@
+import os
+import time
+from typing import Any, Dict, List, Optional, Type, TypeVar
+
+import msgspec
+from fastapi.responses import ORJSONResponse, Response
+
+from tracing import current_trace
+
+# Compact typed structs for the hot response paths (/fixtures, /live,
+# /odds/{fixture_id}): upstream JSON decodes straight into them and they
+# encode straight to bytes, skipping FastAPI's jsonable_encoder. Fields not
+# declared here are dropped, and so are fields still at their default (null,
+# or an empty list the upstream item never had). Opt-in with TYPED_RESPONSES=1.
+TYPED_RESPONSES = os.getenv("TYPED_RESPONSES", "0") == "1"
+
+T = TypeVar("T")
+
+
+class Base(msgspec.Struct, gc=False, omit_defaults=True):
+    pass
+
+
+class Status(Base):
+    long: Optional[str] = None
+    short: Optional[str] = None
+    elapsed: Optional[int] = None
+
+
+class Venue(Base):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    city: Optional[str] = None
+
+
+class Periods(Base):
+    first: Optional[int] = None
+    second: Optional[int] = None
+
+
+class FixtureInfo(Base):
+    id: int
+    referee: Optional[str] = None
+    timezone: Optional[str] = None
+    date: Optional[str] = None
+    timestamp: Optional[int] = None
+    periods: Optional[Periods] = None
+    venue: Optional[Venue] = None
+    status: Optional[Status] = None
+
+
+class League(Base):
+    id: int
+    name: Optional[str] = None
+    country: Optional[str] = None
+    logo: Optional[str] = None
+    flag: Optional[str] = None
+    season: Optional[int] = None
+    round: Optional[str] = None
+
+
+class Team(Base):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    logo: Optional[str] = None
+    winner: Optional[bool] = None
+
+
+class Teams(Base):
+    home: Team
+    away: Team
+
+
+class Goals(Base):
+    home: Optional[int] = None
+    away: Optional[int] = None
+
+
+class Score(Base):
+    halftime: Optional[Goals] = None
+    fulltime: Optional[Goals] = None
+    extratime: Optional[Goals] = None
+    penalty: Optional[Goals] = None
+
+
+class EventTime(Base):
+    elapsed: Optional[int] = None
+    extra: Optional[int] = None
+
+
+class Ref(Base):
+    id: Optional[int] = None
+    name: Optional[str] = None
+
+
+class Event(Base):
+    time: EventTime
+    team: Team
+    player: Ref
+    assist: Optional[Ref] = None
+    type: Optional[str] = None
+    detail: Optional[str] = None
+    comments: Optional[str] = None
+
+
+class OddValue(Base):
+    value: Any
+    odd: Optional[str] = None
+
+
+class Bet(Base):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    values: List[OddValue] = []
+
+
+class Bookmaker(Base):
+    id: Optional[int] = None
+    name: Optional[str] = None
+    bets: List[Bet] = []
+
+
+class OddsFixture(Base):
+    id: int
+    timezone: Optional[str] = None
+    date: Optional[str] = None
+    timestamp: Optional[int] = None
+
+
+class OddsItem(Base):
+    fixture: OddsFixture
+    league: Optional[League] = None
+    update: Optional[str] = None
+    bookmakers: List[Bookmaker] = []
+
+
+class Fixture(Base):
+    fixture: FixtureInfo
+    league: League
+    teams: Teams
+    goals: Optional[Goals] = None
+    score: Optional[Score] = None
+    events: List[Event] = []
+    # predictions are too irregular to type usefully
+    predictions: List[Dict[str, Any]] = []
+    odds: List[OddsItem] = []
+
+
+class Paging(Base, omit_defaults=False):
+    # encoded as {"next": null} on the last page, like the untyped envelope
+    next: Optional[str] = None
+
+
+class FixturesEnvelope(Base):
+    response: List[Fixture]
+    paging: Optional[Paging] = None
+    errors: Optional[Any] = None
+
+
+class OddsEnvelope(Base):
+    response: List[OddsItem]
+    errors: Optional[Any] = None
+
+
+_encoder = msgspec.json.Encoder()
+
+
+def decode(raw: bytes, type: Type[T]) -> T:
+    """Decode upstream JSON bytes directly into typed structs."""
+    return msgspec.json.decode(raw, type=type)
+
+
+def encode(obj: Any) -> bytes:
+    return _encoder.encode(obj)
+
+
+def typed_response(payload: Dict[str, Any], type: Type[Any]) -> Response:
+    """Validate a cached dict payload into `type` and encode it to bytes."""
+    trace = current_trace()
+    started = time.perf_counter()
+    try:
+        typed = msgspec.convert(payload, type)
+    except msgspec.ValidationError:
+        # an upstream shape we don't model yet: serve it untyped
+        response: Response = ORJSONResponse(payload)
+    else:
+        response = Response(encode(typed), media_type="application/json")
+    if trace is not None:
+        trace.render += time.perf_counter() - started
+    return response
@@ -37,6 +37,7 @@ ENDPOINT_TESTS = [
     ("/leagues/seasons", LeagueSeasons),
     ("/standings/39", StandingsResponse),
     ("/teams?country=England&league_id=39&season=2025", TeamsResponse),
+    (f"/value-bets?date={TEST_DATE}", dict),
 ]
 
 @pytest.mark.asyncio
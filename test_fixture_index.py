@@ -0,0 +1,52 @@
+from benchmarks import payloads
+from fixture_index import FixtureIndex
+
+
+def _day(ids, status="NS"):
+    return {"response": [payloads.fixture(fid, status=status) for fid in ids]}
+
+
+def _ids(fixtures):
+    return sorted(fx["fixture"]["id"] for fx in fixtures)
+
+
+def test_lookup_by_league_team_status():
+    index = FixtureIndex()
+    index.ingest("2025-05-11", _day(range(1, 13)))
+    everything = (0, 2 ** 31)
+    fx = payloads.fixture(3)
+    league = fx["league"]["id"]
+    assert _ids(index.lookup(*everything, leagues=[league])) == \
+        [f for f in range(1, 13) if payloads.fixture(f)["league"]["id"] == league]
+    assert _ids(index.lookup(*everything, team=fx["teams"]["away"]["id"])) == [3]
+    assert index.lookup(*everything, status=["FT"]) == []
+
+
+def test_reingest_replaces_the_date():
+    index = FixtureIndex()
+    index.ingest("2025-05-11", _day([1, 2, 3]))
+    index.ingest("2025-05-11", _day([2, 3], status="FT"))
+    assert _ids(index.lookup(0, 2 ** 31)) == [2, 3]
+    assert _ids(index.lookup(0, 2 ** 31, status=["FT"])) == [2, 3]
+    assert index.lookup(0, 2 ** 31, status=["NS"]) == []
+    assert 1 not in index.fixtures
+
+
+def test_rescheduled_fixture_moves_dates():
+    index = FixtureIndex()
+    index.ingest("2025-05-11", _day([1, 2]))
+    index.ingest("2025-05-12", _day([2, 5]))
+    assert _ids(index.lookup(0, 2 ** 31)) == [1, 2, 5]
+    # dropping the old date must not take the moved fixture with it
+    index.ingest("2025-05-11", _day([1]))
+    assert _ids(index.lookup(0, 2 ** 31)) == [1, 2, 5]
+
+
+def test_oldest_dates_are_evicted():
+    index = FixtureIndex(max_dates=2)
+    for i, d in enumerate(["2025-05-10", "2025-05-11", "2025-05-12"]):
+        index.ingest(d, _day([i + 1]))
+    assert not index.has_date("2025-05-10")
+    assert _ids(index.lookup(0, 2 ** 31)) == [2, 3]
+    index.clear()
+    assert index.lookup(0, 2 ** 31) == [] and not index.by_league
@@ -0,0 +1,34 @@
+import api_football
+from api_football import project_payload
+from benchmarks import payloads
+
+
+def test_envelope_slimmed_to_response():
+    raw = payloads.envelope("odds", {"fixture": 1}, payloads.odds(1))
+    assert project_payload("odds", raw) == {"response": raw["response"]}
+
+
+def test_paging_kept_only_when_there_are_more_pages():
+    raw = payloads.envelope("fixtures", {}, [])
+    raw["paging"] = {"current": 1, "total": 3}
+    assert project_payload("fixtures", raw)["paging"] == {"current": 1, "total": 3}
+
+
+def test_predictions_keep_h2h_by_default():
+    raw = payloads.envelope("predictions", {"fixture": 1}, payloads.predictions(1))
+    assert "h2h" in project_payload("predictions", raw)["response"][0]
+
+
+def test_opt_in_drop(monkeypatch):
+    monkeypatch.setitem(api_football.INGEST_DROP, "predictions", {"h2h"})
+    raw = payloads.envelope("predictions", {"fixture": 1}, payloads.predictions(1))
+    item = project_payload("predictions", raw)["response"][0]
+    assert "h2h" not in item and "predictions" in item
+    # the upstream payload itself is left alone
+    assert "h2h" in raw["response"][0]
+
+
+def test_projection_disabled(monkeypatch):
+    monkeypatch.setattr(api_football, "INGEST_PROJECTION", False)
+    raw = payloads.envelope("odds", {"fixture": 1}, payloads.odds(1))
+    assert project_payload("odds", raw) is raw
@@ -0,0 +1,84 @@
+import asyncio
+import random
+
+import pytest
+
+import inplay
+from api_football import final_cache, inplay_cache
+from benchmarks import payloads
+from priority import Priority, current_priority
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+    finals = {}
+
+    async def fetch(endpoint, params=None, cache=None, cache_key=None):
+        calls.append((endpoint, params, current_priority()))
+        if endpoint == "fixtures":
+            return {"response": [finals[params["id"]]]}
+        return {"response": [{"team": {"id": 1}, "statistics": []}]}
+
+    monkeypatch.setattr(inplay, "fetch", fetch)
+    inplay_cache.clear()
+    final_cache.clear()
+    yield calls, finals
+    inplay_cache.clear()
+    final_cache.clear()
+
+
+def _live(*fixtures):
+    return {fx["fixture"]["id"]: fx for fx in fixtures}
+
+
+def test_merge_events_deduplicates(upstream):
+    tracker = inplay.InPlayTracker()
+    rng = random.Random(1)
+    events = [payloads.event(rng, 14, 15) for _ in range(3)]
+    tracker.merge_events(7, events)
+    tracker.merge_events(7, list(events) + [dict(events[0])])
+    assert inplay_cache["events_7"]["response"] == list(events)
+
+
+def test_statistics_are_background_and_capped(upstream):
+    calls, _ = upstream
+    tracker = inplay.InPlayTracker(stats_interval=90, stats_per_cycle=2)
+    live = _live(*(payloads.fixture(fid, status="1H") for fid in (1, 2, 3)))
+
+    asyncio.run(tracker.update(live))
+    assert len(calls) == 2
+    assert all(p == Priority.BACKGROUND for _, _, p in calls)
+    # the fixture left out last cycle is the stalest and goes next
+    asyncio.run(tracker.update(live))
+    assert {c[1]["fixture"] for c in calls} == {1, 2, 3}
+    assert current_priority() == Priority.INTERACTIVE
+
+
+def test_finished_fixture_is_frozen_once(upstream):
+    calls, finals = upstream
+    tracker = inplay.InPlayTracker()
+    running = payloads.fixture(9, status="2H")
+    asyncio.run(tracker.update(_live(running)))
+    assert "events_9" in inplay_cache
+
+    final = payloads.fixture(9, status="FT")
+    final["events"] = [{"type": "Goal", "detail": "VAR checked"}]
+    finals[9] = final
+    asyncio.run(tracker.update(_live(final)))
+    # the final record wins over the merged in-play events
+    assert final_cache["events_9"] == {"response": final["events"]}
+    assert "events_9" not in inplay_cache and "statistics_9" not in inplay_cache
+
+    finalized = [c for c in calls if c[0] == "fixtures"]
+    asyncio.run(tracker.update(_live(final)))
+    assert [c for c in calls if c[0] == "fixtures"] == finalized
+
+
+def test_fixture_leaving_the_feed_is_finalized(upstream):
+    calls, finals = upstream
+    tracker = inplay.InPlayTracker()
+    asyncio.run(tracker.update(_live(payloads.fixture(4, status="1H"))))
+    finals[4] = payloads.fixture(4, status="FT")
+    asyncio.run(tracker.update({}))
+    assert "statistics_4" in final_cache
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import httpx
+import orjson
+import pytest
+
+import api_football
+import jobs
+
+LEAGUES = [{"league": {"id": lid}, "seasons": [{"year": 2024, "current": True}]} for lid in (39, 140)]
+
+
+@pytest.fixture
+def jobs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "JOBS_DIR", str(tmp_path))
+    monkeypatch.setattr(jobs, "registry", {})
+    monkeypatch.setattr(jobs, "team_stats_store", None)
+    monkeypatch.setattr(jobs, "_team_stats_mtime", None)
+    api_football.general_cache.clear()
+    yield tmp_path
+    api_football.general_cache.clear()
+
+
+def _upstream(calls):
+    async def handler(request):
+        path, params = request.url.path.strip("/"), request.url.params
+        if path == "leagues":
+            response = LEAGUES
+        elif path == "teams":
+            league = int(params["league"])
+            response = [{"team": {"id": league * 100 + i}} for i in range(5)]
+        else:
+            calls.append(int(params["team"]))
+            await asyncio.sleep(0.01)
+            response = {"team": {"id": int(params["team"])}}
+        return httpx.Response(200, json={"errors": [], "response": response})
+    return httpx.AsyncClient(base_url=api_football.BASE_URL, transport=httpx.MockTransport(handler))
+
+
+def test_interrupted_crawl_resumes_from_checkpoint(jobs_dir, monkeypatch):
+    calls = []
+    monkeypatch.setattr(api_football, "_client", _upstream(calls))
+
+    async def run():
+        job = jobs.start_team_stats_crawl()
+        while job.done < 3 or job.phase != "crawling":
+            await asyncio.sleep(0.005)
+        job.task.cancel()
+        await asyncio.gather(job.task, return_exceptions=True)
+        assert job.status == "cancelled"
+        assert jobs.team_stats_checkpoint_exists()
+        assert not os.path.exists(jobs._path(jobs._lock_name(jobs.TEAM_STATS_KIND)))
+        assert jobs.get_job(job.id).status == "cancelled"
+
+        finished = {d["team_id"] for d in jobs._read_lines(jobs.TEAM_STATS_DONE)}
+        first_run = len(calls)
+        resumed = jobs.start_team_stats_crawl()
+        assert resumed.id != job.id
+        await resumed.task
+        return finished, calls[first_run:], resumed
+
+    finished, second_calls, resumed = asyncio.run(run())
+    assert resumed.status == "done" and resumed.failed == 0
+    assert finished and not finished & set(second_calls)
+    assert sorted(d["team_id"] for d in jobs.team_stats_store["response"]) == \
+        sorted(l * 100 + i for l in (39, 140) for i in range(5))
+    # a clean finish removes the checkpoints
+    assert not jobs.team_stats_checkpoint_exists()
+
+
+def test_lock_held_by_another_worker(jobs_dir):
+    other = jobs.Job(jobs.TEAM_STATS_KIND)
+    other.pid, other.status = os.getppid(), "running"
+    jobs._save_status(other)
+    with open(jobs._path(jobs._lock_name(other.kind)), "wb") as f:
+        f.write(orjson.dumps({"pid": other.pid, "job": other.id}))
+
+    async def run():
+        return jobs.start_team_stats_crawl()
+
+    job = asyncio.run(run())
+    # no second crawl here: the other worker's job is reported instead
+    assert job.id == other.id and job.task is None and job.status == "running"
+    assert not jobs.registry
+
+
+def test_stale_lock_is_taken_over(jobs_dir, monkeypatch):
+    monkeypatch.setattr(api_football, "_client", _upstream([]))
+    dead = subprocess.Popen([sys.executable, "-c", "pass"])
+    dead.wait()
+    stale = jobs.Job(jobs.TEAM_STATS_KIND)
+    stale.pid, stale.status = dead.pid, "running"
+    jobs._save_status(stale)
+    with open(jobs._path(jobs._lock_name(stale.kind)), "wb") as f:
+        f.write(orjson.dumps({"pid": dead.pid, "job": stale.id}))
+
+    assert jobs.get_job(stale.id).status == "interrupted"
+
+    async def run():
+        job = jobs.start_team_stats_crawl()
+        await job.task
+        return job
+
+    job = asyncio.run(run())
+    assert job.id != stale.id and job.status == "done"
+
+
+def test_store_reloaded_when_another_worker_writes_it(jobs_dir):
+    assert jobs.load_team_stats_store() is None
+    jobs._write_atomic(jobs.TEAM_STATS_STORE, {"updated_at": 1, "response": []})
+    assert jobs.load_team_stats_store()["updated_at"] == 1
+    jobs._write_atomic(jobs.TEAM_STATS_STORE, {"updated_at": 2, "response": []})
+    os.utime(jobs._path(jobs.TEAM_STATS_STORE), ns=(1, 1))
+    assert jobs.load_team_stats_store()["updated_at"] == 2
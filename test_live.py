@@ -0,0 +1,34 @@
+from benchmarks import payloads
+from live import diff_snapshots, index_by_fixture
+
+
+def _snapshot(*fixtures):
+    return index_by_fixture(list(fixtures))
+
+
+def test_new_changed_and_removed():
+    a, b = payloads.fixture(1, status="1H"), payloads.fixture(2, status="1H")
+    b2 = payloads.fixture(2, status="1H")
+    b2["goals"] = {"home": 9, "away": b["goals"]["away"]}
+    c = payloads.fixture(3, status="1H")
+
+    changed, removed = diff_snapshots(_snapshot(a, b), _snapshot(b2, c))
+    by_id = {item["id"]: item for item in changed}
+    assert by_id[3]["data"] is c
+    # only the changed leaf travels
+    assert by_id[2]["changed"] == {"goals": {"home": 9}}
+    assert removed == [{"id": 1, "league": a["league"]["id"]}]
+
+
+def test_unchanged_snapshot_is_silent():
+    a = payloads.fixture(1, status="2H")
+    assert diff_snapshots(_snapshot(a), _snapshot(payloads.fixture(1, status="2H"))) == ([], [])
+
+
+def test_nested_diff_stops_at_depth_two():
+    a = payloads.fixture(1, status="1H")
+    a2 = payloads.fixture(1, status="1H")
+    a2["fixture"]["status"] = {**a["fixture"]["status"], "elapsed": 77}
+    changed, _ = diff_snapshots(_snapshot(a), _snapshot(a2))
+    # fixture.status is below depth 2, so it's sent whole
+    assert changed[0]["changed"] == {"fixture": {"status": a2["fixture"]["status"]}}
@@ -0,0 +1,71 @@
+import pytest
+
+from benchmarks import payloads
+from query import FixtureQuery, decode_cursor, encode_cursor, parse_ids, parse_window
+
+# 10 fixtures, 5 sharing each kickoff so pages must break ties on id
+FIXTURES = [payloads.fixture(100 + i) for i in range(10)]
+for i, fx in enumerate(FIXTURES):
+    fx["fixture"]["timestamp"] = payloads.BASE_TS + (i % 2) * 60
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor((1747000000, 123))) == (1747000000, 123)
+
+
+def test_invalid_cursor():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_parse_ids():
+    assert parse_ids("39, 140,") == {39, 140}
+    assert parse_ids(None) == set()
+    with pytest.raises(ValueError):
+        parse_ids("abc")
+
+
+def test_pages_cover_everything_once():
+    seen, cursor = [], None
+    while True:
+        page, cursor = FixtureQuery(limit=3, cursor=cursor).select(FIXTURES)
+        seen.extend(fx["fixture"]["id"] for fx in page)
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(fx["fixture"]["id"] for fx in FIXTURES)
+    assert len(seen) == len(set(seen))
+
+
+def test_exact_last_page_has_no_cursor():
+    page, cursor = FixtureQuery(limit=10).select(FIXTURES)
+    assert len(page) == 10 and cursor is None
+    page, cursor = FixtureQuery(limit=9).select(FIXTURES)
+    assert len(page) == 9 and cursor is not None
+    page, cursor = FixtureQuery(limit=9, cursor=cursor).select(FIXTURES)
+    assert len(page) == 1 and cursor is None
+
+
+def test_filter_runs_before_paging():
+    league = FIXTURES[0]["league"]["id"]
+    query = FixtureQuery.from_params(league=str(league), limit=100)
+    page, _ = query.select(FIXTURES)
+    assert page and all(fx["league"]["id"] == league for fx in page)
+
+
+def test_envelope_projects_fields():
+    query = FixtureQuery.from_params(fields="fixture.id,teams.home.id", limit=1)
+    page, cursor = query.select(FIXTURES)
+    body = query.envelope(page, cursor)
+    assert body["response"] == [{"fixture": {"id": page[0]["fixture"]["id"]},
+                                 "teams": {"home": {"id": page[0]["teams"]["home"]["id"]}}}]
+    assert body["paging"] == {"next": cursor}
+
+
+def test_parse_window():
+    start, end, dates = parse_window("2025-05-10", "2025-05-12")
+    assert dates == ["2025-05-10", "2025-05-11", "2025-05-12"]
+    assert end - start == 3 * 86400 - 1
+    with pytest.raises(ValueError):
+        parse_window("2025-05-12", "2025-05-10")
+    with pytest.raises(ValueError):
+        parse_window("2025-05-01", "2025-05-20")
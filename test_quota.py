@@ -0,0 +1,57 @@
+from priority import Priority
+from quota import QUOTA_BACKGROUND_RESERVE, QUOTA_BULK_RESERVE, QUOTA_MINUTE_RESERVE, QuotaManager
+
+
+def _headers(daily, minute, daily_limit=10000, minute_limit=300):
+    return {
+        "x-ratelimit-requests-remaining": str(daily),
+        "x-ratelimit-requests-limit": str(daily_limit),
+        "x-ratelimit-remaining": str(minute),
+        "x-ratelimit-limit": str(minute_limit),
+    }
+
+
+def test_unknown_budget_allows_everything():
+    quota = QuotaManager()
+    assert all(quota.allows(p) for p in Priority)
+
+
+def test_daily_reserves():
+    quota = QuotaManager()
+    between = int(10000 * (QUOTA_BULK_RESERVE + QUOTA_BACKGROUND_RESERVE) / 2)
+    quota.update(_headers(between, 300))
+    assert not quota.allows(Priority.BULK)
+    assert quota.allows(Priority.BACKGROUND)
+
+    quota.update(_headers(int(10000 * QUOTA_BACKGROUND_RESERVE) - 1, 300))
+    assert not quota.allows(Priority.BACKGROUND)
+    # interactive traffic is never refused
+    assert quota.allows(Priority.INTERACTIVE)
+
+    quota.update(_headers(10000, 300))
+    assert all(quota.allows(p) for p in Priority)
+
+
+def test_minute_reserve():
+    quota = QuotaManager()
+    quota.update(_headers(10000, QUOTA_MINUTE_RESERVE))
+    assert not quota.allows(Priority.BACKGROUND)
+    assert not quota.allows(Priority.BULK)
+    quota.update(_headers(10000, QUOTA_MINUTE_RESERVE * 2))
+    assert quota.allows(Priority.BACKGROUND)
+    assert not quota.allows(Priority.BULK)
+
+
+def test_stale_minute_window_is_ignored():
+    quota = QuotaManager()
+    quota.update(_headers(10000, 0))
+    quota._minute_seen_at -= 61
+    assert quota.allows(Priority.BULK)
+
+
+def test_consume_counts_ahead_of_headers():
+    quota = QuotaManager()
+    quota.update(_headers(int(10000 * QUOTA_BULK_RESERVE) + 1, 300))
+    assert quota.allows(Priority.BULK)
+    quota.consume()
+    assert not quota.allows(Priority.BULK)
@@ -0,0 +1,72 @@
+import asyncio
+
+from priority import Priority
+from scheduler import PriorityScheduler
+
+
+async def _hold(sched: PriorityScheduler, level: Priority, release: asyncio.Event):
+    await sched.acquire(level)
+    await release.wait()
+    sched.release()
+
+
+def test_interactive_admitted_past_queued_bulk():
+    async def run():
+        sched = PriorityScheduler(slots=8)          # bulk limit: 2 slots
+        release = asyncio.Event()
+        bulk = [asyncio.create_task(_hold(sched, Priority.BULK, release)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert sched.in_use == 2 and sched.status()["waiting"] == 3
+
+        # 6 slots idle: an interactive call must not wait for a bulk release
+        await asyncio.wait_for(sched.acquire(Priority.INTERACTIVE), 0.1)
+        assert sched.in_use == 3
+        sched.release()
+
+        release.set()
+        await asyncio.gather(*bulk)
+        assert sched.in_use == 0 and sched.status()["waiting"] == 0
+
+    asyncio.run(run())
+
+
+def test_waiters_served_by_priority():
+    async def run():
+        sched = PriorityScheduler(slots=4)          # limits: 4 / 2 / 1
+        for _ in range(4):
+            await sched.acquire(Priority.INTERACTIVE)
+        order = []
+
+        async def waiter(level):
+            await sched.acquire(level)
+            order.append(level)
+
+        tasks = [asyncio.create_task(waiter(l)) for l in
+                 (Priority.BULK, Priority.BACKGROUND, Priority.INTERACTIVE)]
+        await asyncio.sleep(0)
+        for _ in range(4):
+            sched.release()
+        await asyncio.sleep(0)
+        # bulk waits while two slots are busy, even though it queued first
+        assert order == [Priority.INTERACTIVE, Priority.BACKGROUND]
+        sched.release()
+        sched.release()
+        await asyncio.gather(*tasks)
+        assert order[-1] == Priority.BULK
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def run():
+        sched = PriorityScheduler(slots=1)
+        await sched.acquire(Priority.INTERACTIVE)
+        waiting = asyncio.create_task(sched.acquire(Priority.INTERACTIVE))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        sched.release()
+        assert sched.in_use == 0
+        await asyncio.wait_for(sched.acquire(Priority.INTERACTIVE), 0.1)
+
+    asyncio.run(run())
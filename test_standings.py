@@ -0,0 +1,62 @@
+import asyncio
+
+import pytest
+
+import standings
+from standings import StandingsSnapshot
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    tables = {}
+
+    async def fetch(endpoint, params=None, cache=None, cache_key=None):
+        return {"response": tables[params["league"]]}
+
+    monkeypatch.setattr(standings, "fetch", fetch)
+    return tables
+
+
+def _active(snapshot, monkeypatch, leagues):
+    async def active_leagues():
+        return dict(leagues)
+
+    monkeypatch.setattr(snapshot, "active_leagues", active_leagues)
+
+
+def test_unchanged_table_keeps_its_entry(upstream, monkeypatch):
+    snapshot = StandingsSnapshot()
+    _active(snapshot, monkeypatch, {39: 2025, 140: 2025})
+    upstream.update({39: [{"rank": 1}], 140: [{"rank": 1}]})
+
+    assert asyncio.run(snapshot.refresh())["updated"] == 2
+    before = snapshot.get(39)
+    upstream[140] = [{"rank": 2}]
+    counts = asyncio.run(snapshot.refresh())
+    assert (counts["unchanged"], counts["updated"]) == (1, 1)
+    assert snapshot.get(39) is before
+    assert snapshot.get(140)["standings"] == [{"rank": 2}]
+
+
+def test_leagues_leaving_the_window_are_pruned(upstream, monkeypatch):
+    snapshot = StandingsSnapshot()
+    upstream.update({39: [], 140: []})
+    _active(snapshot, monkeypatch, {39: 2025, 140: 2025})
+    asyncio.run(snapshot.refresh())
+
+    _active(snapshot, monkeypatch, {39: 2025})
+    counts = asyncio.run(snapshot.refresh())
+    assert counts["removed"] == 1
+    assert snapshot.get(140) is None
+    assert [t["league_id"] for t in snapshot.all()["response"]] == [39]
+
+
+def test_window_wider_than_a_week(monkeypatch):
+    indexed = []
+
+    async def ensure_fixtures_indexed(dates):
+        indexed.extend(dates)
+
+    monkeypatch.setattr(standings, "ensure_fixtures_indexed", ensure_fixtures_indexed)
+    asyncio.run(StandingsSnapshot(window_days=7).active_leagues())
+    assert len(indexed) == 15
@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+import api_football
+from benchmarks import payloads
+
+FIXTURES = list(range(1, 31))
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    async def get_raw_fixtures(date_str):
+        return {"response": [payloads.fixture(fid) for fid in FIXTURES]}
+
+    async def get_predictions_cached(fid):
+        return {"response": payloads.predictions(fid)}
+
+    async def get_odds_cached(fid):
+        return {"response": payloads.odds(fid)}
+
+    monkeypatch.setattr(api_football, "get_raw_fixtures", get_raw_fixtures)
+    monkeypatch.setattr(api_football, "get_predictions_cached", get_predictions_cached)
+    monkeypatch.setattr(api_football, "get_odds_cached", get_odds_cached)
+
+
+def _expected(fid, outcome):
+    percent = payloads.predictions(fid)[0]["predictions"]["percent"][outcome]
+    label = {"home": "Home", "draw": "Draw", "away": "Away"}[outcome]
+    best = max(
+        float(v["odd"])
+        for bm in payloads.odds(fid)[0]["bookmakers"]
+        for bet in bm["bets"] if bet["id"] == 1
+        for v in bet["values"] if v["value"] == label
+    )
+    return float(percent.rstrip("%")) / 100.0, best
+
+
+def test_percent_parsing():
+    assert api_football._percent("45%") == 0.45
+    assert api_football._percent(None) is None
+    assert api_football._percent("n/a") is None
+
+
+def test_best_price_across_bookmakers():
+    odds = [{"bookmakers": [
+        {"bets": [{"id": 1, "values": [{"value": "Home", "odd": "2.10"}, {"value": "Draw", "odd": "3.40"}]}]},
+        {"bets": [
+            {"id": 5, "values": [{"value": "Home", "odd": "9.00"}]},
+            {"id": 1, "values": [{"value": "Home", "odd": "2.25"}, {"value": "Away", "odd": "x"}]},
+        ]},
+    ]}]
+    assert api_football._best_match_winner_prices(odds) == {"home": 2.25, "draw": 3.40}
+
+
+def test_value_bets_are_filtered_and_sorted(upstream):
+    threshold = 1.05
+    result = asyncio.run(api_football.get_value_bets_by_date("2025-05-11", threshold))["response"]
+    assert result
+
+    values = [bet["value"] for bet in result]
+    assert values == sorted(values, reverse=True)
+    for bet in result:
+        prob, price = _expected(bet["fixture"]["id"], bet["outcome"])
+        assert (bet["probability"], bet["odd"]) == (prob, price)
+        assert bet["value"] == round(prob * price, 4) > threshold
+
+    # every outcome above the threshold is listed, and nothing else
+    above = set()
+    for fid in FIXTURES:
+        for outcome in ("home", "draw", "away"):
+            prob, price = _expected(fid, outcome)
+            if prob and prob * price > threshold:
+                above.add((fid, outcome))
+    assert {(bet["fixture"]["id"], bet["outcome"]) for bet in result} == above
+    assert len(above) < 3 * len(FIXTURES)
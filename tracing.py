@@ -0,0 +1,207 @@
+import asyncio
+import os
+import time
+import uuid
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Dict, List, Optional
+
+from cachetools import LRUCache
+from fastapi.routing import APIRoute
+
+# finished traces kept for GET /debug/traces/{trace_id}
+TRACE_HISTORY = int(os.getenv("TRACE_HISTORY", "100"))
+
+
+class Span:
+    """One fetch() call made while serving a traced request."""
+    __slots__ = ("endpoint", "params", "start", "duration", "cache",
+                 "lock_wait", "queue_wait", "upstream", "ok")
+
+    def __init__(self, endpoint: str, params: Optional[Dict[str, Any]]):
+        self.endpoint = endpoint
+        self.params = params
+        self.start = time.perf_counter()
+        self.duration = 0.0
+        self.cache: Optional[str] = None     # hit, miss, degraded; None if uncached
+        self.lock_wait = 0.0
+        self.queue_wait = 0.0
+        self.upstream = 0.0
+        self.ok = True
+
+
+class Trace:
+    def __init__(self, method: str, path: str):
+        self.id = uuid.uuid4().hex[:16]
+        self.method = method
+        self.path = path
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[Span] = []
+        self.render = 0.0                     # serializing the response
+        self._returned: Optional[float] = None  # when the endpoint returned
+        self.total = 0.0
+
+    def start(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Span:
+        span = Span(endpoint, params)
+        self.spans.append(span)
+        return span
+
+    def finish(self, span: Span) -> None:
+        span.duration = time.perf_counter() - span.start
+
+    def close(self) -> None:
+        self.total = time.perf_counter() - self._t0
+
+    def summary(self) -> Dict[str, Any]:
+        upstream = [s for s in self.spans if s.upstream]
+        return {
+            "calls": len(self.spans),
+            "cache_hits": sum(1 for s in self.spans if s.cache == "hit"),
+            "upstream_calls": len(upstream),
+            "degraded": sum(1 for s in self.spans if s.cache == "degraded"),
+            "failed": sum(1 for s in self.spans if not s.ok),
+            # summed over concurrent calls, so these can exceed total_ms
+            "upstream_ms": _ms(sum(s.upstream for s in upstream)),
+            "lock_wait_ms": _ms(sum(s.lock_wait for s in self.spans)),
+            "queue_wait_ms": _ms(sum(s.queue_wait for s in self.spans)),
+            "slowest_upstream_ms": _ms(max((s.upstream for s in upstream), default=0.0)),
+            "render_ms": _ms(self.render),
+            "total_ms": _ms(self.total),
+        }
+
+    def server_timing(self) -> str:
+        s = self.summary()
+        return ", ".join([
+            f'upstream;dur={s["upstream_ms"]};desc="{s["upstream_calls"]} calls"',
+            f'cache;desc="{s["cache_hits"]} hits"',
+            f"lock;dur={s['lock_wait_ms']}",
+            f"queue;dur={s['queue_wait_ms']}",
+            f"render;dur={s['render_ms']}",
+            f"total;dur={s['total_ms']}",
+        ])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at,
+            "summary": self.summary(),
+            "calls": [{
+                "endpoint": s.endpoint,
+                "params": s.params,
+                "cache": s.cache,
+                "offset_ms": _ms(s.start - self._t0),
+                "lock_wait_ms": _ms(s.lock_wait),
+                "queue_wait_ms": _ms(s.queue_wait),
+                "upstream_ms": _ms(s.upstream),
+                "duration_ms": _ms(s.duration),
+                "ok": s.ok,
+            } for s in self.spans],
+        }
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+traces: LRUCache = LRUCache(maxsize=TRACE_HISTORY)
+
+
+def current_trace() -> Optional[Trace]:
+    return _current.get()
+
+
+def detach_trace() -> None:
+    """
+    Drop the trace inherited from the request that started this task, so
+    long-lived background work doesn't keep appending to it.
+    """
+    _current.set(None)
+
+
+def record_hit(endpoint: str, params: Optional[Dict[str, Any]],
+               started: Optional[float] = None) -> None:
+    """Record a lookup answered from a cache without going through fetch()."""
+    trace = _current.get()
+    if trace is None:
+        return
+    span = trace.start(endpoint, params)
+    if started is not None:
+        span.start = started
+    span.cache = "hit"
+    trace.finish(span)
+
+
+class TracedRoute(APIRoute):
+    """
+    Adds the time from the endpoint returning until the response is built
+    (jsonable_encoder and rendering) to the active trace.
+    """
+
+    def get_route_handler(self):
+        call = self.dependant.call
+        if asyncio.iscoroutinefunction(call) and not hasattr(call, "__traced__"):
+            @wraps(call)
+            async def endpoint(*args, **kwargs):
+                result = await call(*args, **kwargs)
+                trace = _current.get()
+                if trace is not None:
+                    trace._returned = time.perf_counter()
+                return result
+
+            endpoint.__traced__ = True
+            self.dependant.call = endpoint
+        handler = super().get_route_handler()
+
+        async def traced_handler(request):
+            response = await handler(request)
+            trace = _current.get()
+            if trace is not None and trace._returned is not None:
+                trace.render += time.perf_counter() - trace._returned
+                trace._returned = None
+            return response
+
+        return traced_handler
+
+
+def _wants_trace(scope) -> bool:
+    if b"trace=1" in scope.get("query_string", b"").split(b"&"):
+        return True
+    return any(k == b"x-debug-trace" and v == b"1" for k, v in scope.get("headers", []))
+
+
+class TracingMiddleware:
+    """
+    Opt-in per request (`X-Debug-Trace: 1` header or `?trace=1`): records
+    every fetch() the request triggers and answers with Server-Timing and
+    X-Trace-Id headers; the full breakdown is kept for /debug/traces/{id}.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _wants_trace(scope):
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace(scope["method"], scope["path"])
+        token = _current.set(trace)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                trace.close()
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode()))
+                headers.append((b"x-trace-id", trace.id.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            traces[trace.id] = trace